@@ -11,23 +11,40 @@ Usage:
     uvicorn genesis.api.server:app --reload --port 8000
 """
 
+import os
 import re
+import sys
+import time
 import asyncio
-import json
+import codecs
+import hashlib
+import threading
 import importlib.util
+import inspect
+import pty
+import subprocess
+import signal
+import struct
+import fcntl
+import termios
 from pathlib import Path
-from typing import Dict, List, Any, Optional, Set
+from typing import AsyncIterator, Callable, Dict, List, Any, Optional, Set, Tuple
+from collections import OrderedDict, deque
+from itertools import chain
 from datetime import datetime
 from dataclasses import dataclass, field
 from contextlib import asynccontextmanager
 import uuid
 
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException, BackgroundTasks
+import httpx
+import orjson
+from fastapi import FastAPI, Request, WebSocket, WebSocketDisconnect, HTTPException
+from fastapi.encoders import jsonable_encoder
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, Field
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
+from pydantic import BaseModel, Field, TypeAdapter, field_validator
 
 # Import database module directly (avoid genesis/__init__.py which has heavy deps)
-import sys
 _db_path = Path(__file__).parent.parent / "database.py"
 _spec = importlib.util.spec_from_file_location("database", _db_path)
 db = importlib.util.module_from_spec(_spec)
@@ -47,6 +64,17 @@ class FactoryCreate(BaseModel):
     assistants: List[str] = Field(default_factory=lambda: ["security", "performance"])
 
 
+class FactoryUpdate(BaseModel):
+    """Request model for updating a factory (unknown fields are ignored)"""
+    name: Optional[str] = Field(default=None, min_length=1, max_length=100)
+    domain: Optional[str] = Field(default=None, min_length=1, max_length=50)
+    description: Optional[str] = None
+    status: Optional[str] = None
+    assistants: Optional[List[str]] = None
+    config: Optional[Dict[str, Any]] = None
+    features_built: Optional[int] = None
+
+
 class FactoryResponse(BaseModel):
     """Response model for factory"""
     id: str
@@ -80,6 +108,35 @@ class Finding(BaseModel):
     code_snippet: Optional[str] = None
     recommendation: Optional[str] = None
 
+    def as_dict(self) -> Dict[str, Any]:
+        """Plain dict for JSON storage (cheaper than model_dump for this flat model)"""
+        return {
+            "id": self.id, "severity": self.severity, "title": self.title,
+            "description": self.description, "assistant": self.assistant,
+            "line": self.line, "code_snippet": self.code_snippet,
+            "recommendation": self.recommendation,
+        }
+
+
+# Reviews store only the head of the code; AI review prompts are capped so
+# huge pastes don't blow up token spend (pattern analysis still sees it all)
+SNIPPET_CHARS = 1000
+MAX_PROMPT_CODE_CHARS = 50_000
+
+# Summary keys, in report order
+SEVERITIES = ("critical", "high", "medium", "low")
+_SEV_IDX = {sev: i for i, sev in enumerate(SEVERITIES)}
+
+
+def severity_summary(findings: List[Finding]) -> Dict[str, int]:
+    """Count findings per severity"""
+    counts = [0, 0, 0, 0]
+    for finding in findings:
+        i = _SEV_IDX.get(finding.severity)
+        if i is not None:
+            counts[i] += 1
+    return dict(zip(SEVERITIES, counts, strict=True))
+
 
 class CodeReviewResponse(BaseModel):
     """Response model for code review"""
@@ -111,18 +168,64 @@ class ServerState:
     """Server state for assistants (loaded in memory)"""
     assistants: Dict[str, Any] = field(default_factory=dict)
     assistant_configs: Dict[str, Dict] = field(default_factory=dict)
+    # Response bodies for the assistant endpoints, encoded once in
+    # load_assistants; assistants don't change at runtime
+    assistant_list_json: bytes = b"[]"
+    assistant_detail_json: Dict[str, bytes] = field(default_factory=dict)
+    # Zero-argument public methods served by the patterns endpoint, and the
+    # public methods that need arguments (answered with 400, never called)
+    assistant_patterns: Dict[str, Dict[str, Callable]] = field(default_factory=dict)
+    assistant_arg_methods: Dict[str, Set[str]] = field(default_factory=dict)
+    # Encoded pattern responses and their ETags, filled on first request;
+    # pattern methods return static reference data
+    assistant_pattern_json: Dict[tuple, tuple] = field(default_factory=dict)
     active_connections: Dict[str, Set[WebSocket]] = field(default_factory=dict)
 
 
 state = ServerState()
 
 
+# Settings read on every AI request, and the settings views the dashboard
+# polls; writes through /api/settings clear both
+_SETTINGS_TTL = 30.0
+_SETTINGS_VIEW_TTL = 60.0
+_settings_cache: Dict[str, tuple] = {}
+_settings_views: Dict[str, tuple] = {}
+
+
+def _cached_setting(key: str) -> Optional[str]:
+    """Get db.get_setting(key), re-read at most once per _SETTINGS_TTL seconds"""
+    now = time.monotonic()
+    hit = _settings_cache.get(key)
+    if hit is not None and now - hit[0] < _SETTINGS_TTL:
+        return hit[1]
+    value = db.get_setting(key)
+    _settings_cache[key] = (now, value)
+    return value
+
+
+def _cached_settings_view(name: str, fetch, *args):
+    """Get fetch(*args), re-read at most once per _SETTINGS_VIEW_TTL seconds"""
+    key = f"{name}:{args}"
+    now = time.monotonic()
+    hit = _settings_views.get(key)
+    if hit is not None and now - hit[0] < _SETTINGS_VIEW_TTL:
+        return hit[1]
+    value = fetch(*args)
+    _settings_views[key] = (now, value)
+    return value
+
+
+def invalidate_settings_cache() -> None:
+    """Drop cached settings so the next read sees the database"""
+    _settings_cache.clear()
+    _settings_views.clear()
+
+
 def get_api_key(key_name: str = "anthropic_api_key") -> Optional[str]:
     """Get API key from database, falling back to environment variable"""
-    import os
-
     # Try database first
-    db_value = db.get_setting(key_name)
+    db_value = _cached_setting(key_name)
     if db_value:
         return db_value
 
@@ -133,10 +236,352 @@ def get_api_key(key_name: str = "anthropic_api_key") -> Optional[str]:
 
 def get_ai_model() -> str:
     """Get configured AI model"""
-    model = db.get_setting("ai_model")
+    model = _cached_setting("ai_model")
     return model or "claude-sonnet-4-20250514"
 
 
+# Shared Anthropic client so requests reuse pooled keep-alive connections.
+# With h2 installed (httpx[http2]) concurrent calls multiplex over one
+# connection; without it httpx stays on HTTP/1.1.
+ANTHROPIC_URL = "https://api.anthropic.com/v1/messages"
+ANTHROPIC_CLIENT = httpx.AsyncClient(
+    http2=importlib.util.find_spec("h2") is not None,
+    timeout=30.0,
+    headers={"anthropic-version": "2023-06-01", "content-type": "application/json"},
+    limits=httpx.Limits(max_keepalive_connections=20, max_connections=100),
+)
+
+
+def _ai_cache_key(model: str, max_tokens: int, prompt: str) -> str:
+    """ai_cache key for a single-turn prompt"""
+    return hashlib.blake2b(f"{model}|{max_tokens}|{prompt}".encode(), digest_size=16).hexdigest()
+
+
+async def _anthropic_call(
+    api_key: str,
+    prompt: str,
+    max_tokens: int,
+    parse: Optional[Callable[[str], Any]] = None,
+) -> Any:
+    """Send a single-turn prompt to Claude and return the reply text
+
+    Replies are cached in the db by (model, max_tokens, prompt), so retries
+    and re-reviews of unchanged code skip the round trip. With parse, the
+    parsed reply is returned instead, and a reply is only cached once parse
+    accepts it; replies cut off at max_tokens are never cached.
+    """
+    model = get_ai_model()
+    key = _ai_cache_key(model, max_tokens, prompt)
+    cached = db.get_ai_cache(key)
+    if cached is not None:
+        return parse(cached) if parse else cached
+
+    response = await ANTHROPIC_CLIENT.post(
+        ANTHROPIC_URL,
+        headers={"x-api-key": api_key},
+        json={
+            "model": model,
+            "max_tokens": max_tokens,
+            "messages": [{"role": "user", "content": prompt}]
+        },
+        timeout=30.0
+    )
+
+    if response.status_code != 200:
+        raise HTTPException(status_code=502, detail=f"AI service error: {response.text}")
+
+    reply = orjson.loads(response.content)
+    ai_text = reply["content"][0]["text"]
+    result = parse(ai_text) if parse else ai_text
+    if reply.get("stop_reason") != "max_tokens":
+        db.put_ai_cache(key, model, ai_text)
+    return result
+
+
+async def _anthropic_stream(api_key: str, prompt: str, max_tokens: int) -> AsyncIterator[str]:
+    """Like _anthropic_call, but yield the reply text as Claude produces it
+
+    A cache hit is yielded in one piece; only a stream that reaches
+    message_stop without hitting max_tokens is cached.
+    """
+    model = get_ai_model()
+    key = _ai_cache_key(model, max_tokens, prompt)
+    cached = db.get_ai_cache(key)
+    if cached is not None:
+        yield cached
+        return
+
+    parts = []
+    async with ANTHROPIC_CLIENT.stream(
+        "POST",
+        ANTHROPIC_URL,
+        headers={"x-api-key": api_key},
+        json={
+            "model": model,
+            "max_tokens": max_tokens,
+            "stream": True,
+            "messages": [{"role": "user", "content": prompt}]
+        },
+        timeout=30.0
+    ) as response:
+        if response.status_code != 200:
+            await response.aread()
+            raise HTTPException(status_code=502, detail=f"AI service error: {response.text}")
+
+        stop_reason = None
+        completed = False
+        async for line in response.aiter_lines():
+            if not line.startswith("data:"):
+                continue
+            event = orjson.loads(line[5:])
+            event_type = event.get("type")
+            if event_type == "content_block_delta":
+                text = event["delta"].get("text")
+                if text:
+                    parts.append(text)
+                    yield text
+            elif event_type == "message_delta":
+                stop_reason = event.get("delta", {}).get("stop_reason") or stop_reason
+            elif event_type == "message_stop":
+                completed = True
+            elif event_type == "error":
+                error = event.get("error", {})
+                raise HTTPException(
+                    status_code=502,
+                    detail=f"AI service error: {error.get('message', error)}"
+                )
+
+    # Only a reply that finished on its own is worth replaying; a dropped
+    # connection or a max_tokens cut-off would otherwise be served for days
+    if completed and stop_reason != "max_tokens":
+        db.put_ai_cache(key, model, "".join(parts))
+
+
+# First fenced block in a reply; the info string (```json, ```python) is dropped
+_FENCE_RE = re.compile(r"```[\w+-]*[ \t]*\n?(.*?)(?:```|\Z)", re.DOTALL)
+
+
+def _unfence(ai_text: str) -> str:
+    """Return the contents of the first markdown code block, or the whole text"""
+    m = _FENCE_RE.search(ai_text)
+    return (m.group(1) if m else ai_text).strip()
+
+
+def _parse_json_reply(ai_text: str) -> Any:
+    """Decode the JSON payload of a reply, fenced or not"""
+    return orjson.loads(_unfence(ai_text))
+
+
+_CSV_RE = re.compile(r"\s*,\s*")
+
+
+def _split_csv(s: str) -> List[str]:
+    """Split a comma-separated answer into trimmed, non-empty items"""
+    return [x for x in _CSV_RE.split(s.strip()) if x] if s else []
+
+
+# Prompt templates, filled with str.format (literal braces are doubled)
+_REVIEW_PROMPT = """You are an expert code reviewer specializing in {assistant_context}.
+
+Analyze this {language} code for issues related to: {assistant_context}
+
+CODE TO REVIEW:
+```{language}
+{code}
+```
+
+For each issue found, respond with a JSON array of findings. Each finding must have:
+- severity: "critical", "high", "medium", or "low"
+- title: Short title (max 50 chars)
+- description: What's wrong and why it matters
+- line: Line number where issue occurs (integer)
+- recommendation: How to fix it
+
+Focus on actionable, specific issues. Don't repeat the same issue multiple times.
+Return ONLY a valid JSON array, no other text."""
+
+_FIX_PROMPT = """You are an expert {language} developer. Fix the following code issue.
+
+ISSUE: {finding_title}
+DESCRIPTION: {finding_description}
+RECOMMENDATION: {recommendation}
+
+ORIGINAL CODE:
+```{language}
+{code}
+```
+
+Provide the FIXED code that resolves this issue. Only return the fixed code, no explanations.
+Return the complete fixed code wrapped in a code block."""
+
+_QUESTION_PROMPT = """You are a software architect and UX designer helping plan a new project.
+
+The user wants to create a {domain} application called "{name}".
+Description: {description}{design_context}
+
+Generate 5-6 clarifying questions to understand their requirements better.
+Focus on:
+1. Key features they need (MULTISELECT - user can pick multiple)
+2. Compliance/security requirements (MULTISELECT)
+3. Integrations needed (MULTISELECT)
+4. Scale expectations
+5. UI/UX preferences (visual style, target audience, key user flows)
+6. Design system preferences (component library, responsive approach)
+
+Return a JSON array of questions. Each question must have exactly these fields:
+- id: unique string identifier (e.g., "features", "compliance", "ui_style")
+- question: the question text
+- context: brief context or why this matters
+- options: array of suggested answers (provide options for all questions to make selection easier)
+- multiselect: boolean - true if user can select multiple options, false for single choice
+
+IMPORTANT: For features, compliance, and integrations questions, set multiselect=true so users can select all that apply.
+
+Example format:
+[
+  {{"id": "features", "question": "What features do you need?", "context": "Select all that apply", "options": ["User Authentication", "Dashboard", "Payments", "Admin Panel", "API", "Notifications", "Reports", "Search"], "multiselect": true}},
+  {{"id": "compliance", "question": "What compliance requirements apply?", "context": "Select all that apply", "options": ["HIPAA", "PCI-DSS", "GDPR", "SOC2", "None"], "multiselect": true}},
+  {{"id": "integrations", "question": "What integrations do you need?", "context": "Select all that apply", "options": ["Stripe/Payments", "Auth0/OAuth", "Email (SendGrid)", "AWS/Cloud", "Database", "Analytics"], "multiselect": true}},
+  {{"id": "scale", "question": "Expected scale?", "context": "Affects architecture decisions", "options": ["Small (<1k users)", "Medium (1k-100k)", "Large (100k+)"], "multiselect": false}},
+  {{"id": "ui_style", "question": "What visual style fits your brand?", "context": "Influences component design", "options": ["Modern & Clean", "Playful & Colorful", "Corporate & Professional", "Minimal & Elegant"], "multiselect": false}}
+]
+
+Return ONLY valid JSON array, no other text."""
+
+_PLAN_PROMPT = """You are a senior software architect and UX designer creating a DETAILED implementation plan.
+
+PROJECT: {name}
+DOMAIN: {domain}
+DESCRIPTION: {description}
+
+USER REQUIREMENTS:
+{answers_text}{design_context}
+
+
+AVAILABLE ASSISTANTS & TOOLS:
+- security: Code security analysis, vulnerability detection, OWASP patterns
+- performance: Performance optimization, caching strategies, query optimization
+- accessibility: WCAG compliance, screen reader support, keyboard navigation
+- fhir: Healthcare FHIR data standards and HL7 compliance
+- hipaa: HIPAA compliance patterns, PHI handling, audit logging
+- pci_dss: Payment card security, tokenization, secure data handling
+- gdpr: Data privacy, consent management, right to deletion
+- sox: Financial audit trails, access controls
+- multitenancy: Multi-tenant architecture, data isolation, tenant management
+- iot: IoT protocols, device management, real-time data streams
+
+
+Create a comprehensive factory plan with DETAILED sub-plans for EACH feature. Return a JSON object:
+{{
+    "name": "{name}",
+    "domain": "{domain}",
+    "description": "enhanced description based on requirements",
+    "architecture": "recommended architecture pattern with detailed explanation",
+    "assistants": ["relevant assistants from the available tools list above"],
+    "features": ["list of 5-10 features to build"],
+    "compliance": ["applicable compliance requirements"],
+    "integrations": ["external integrations needed"],
+    "data_models": ["key data entities/models"],
+    "api_endpoints": ["main API endpoints with methods: GET /api/users, POST /api/auth, etc."],
+    "security_considerations": ["security notes and recommendations"],
+    "estimated_complexity": "low" or "medium" or "high",
+    "ui_ux": {{
+        "style": "visual style",
+        "color_scheme": "recommended colors",
+        "target_audience": "who uses this",
+        "inspiration_urls": ["user-provided reference URLs"],
+        "key_pages": ["main pages/screens"],
+        "component_library": "recommended UI library",
+        "accessibility_level": "AA or AAA",
+        "responsive_priority": "mobile-first or desktop-first",
+        "special_requirements": ["dark mode", "RTL", etc.]
+    }},
+    "feature_plans": [
+        {{
+            "feature": "Feature Name",
+            "description": "What this feature does and why",
+            "tasks": ["Specific implementation task 1", "Task 2", "Task 3"],
+            "components": ["UI Component 1", "Component 2"],
+            "api_routes": ["POST /api/feature", "GET /api/feature/:id"],
+            "data_models": ["Model1", "Model2"],
+            "dependencies": ["Other features this depends on"],
+            "assistant_tools": ["Which assistants help: security, performance, etc."],
+            "estimated_effort": "low/medium/high"
+        }}
+    ]
+}}
+
+IMPORTANT: Create a feature_plan entry for EACH feature in the features list. Be specific about:
+- Exact implementation tasks (what code to write)
+- Which UI components are needed
+- Which API routes support this feature
+- Which data models are involved
+- Which assistant tools should review this feature
+
+Return ONLY valid JSON, no other text."""
+
+
+# /health and the dashboard poll the counts; endpoints that change them
+# call invalidate_stats_cache(), so the TTL only bounds out-of-band writes.
+_STATS_TTL = 5.0
+_stats_cache: Dict[str, Any] = {"ts": 0.0, "val": None, "gen": 0}
+_stats_inflight: Optional[asyncio.Task] = None
+
+
+async def _fetch_stats() -> Dict[str, Any]:
+    global _stats_inflight
+    gen = _stats_cache["gen"]
+    try:
+        stats = await asyncio.to_thread(db.get_stats)
+    finally:
+        # An invalidation may already have replaced this task
+        if _stats_inflight is asyncio.current_task():
+            _stats_inflight = None
+    # Don't cache a read that raced an invalidating write
+    if gen == _stats_cache["gen"]:
+        _stats_cache["val"] = stats
+        _stats_cache["ts"] = time.monotonic()
+    return stats
+
+
+async def get_cached_stats() -> Dict[str, Any]:
+    """Get db.get_stats(), refreshed at most once per _STATS_TTL seconds
+
+    Concurrent misses share one database read instead of each running it.
+    """
+    global _stats_inflight
+    if _stats_cache["val"] is not None and time.monotonic() - _stats_cache["ts"] <= _STATS_TTL:
+        return _stats_cache["val"]
+    if _stats_inflight is None:
+        _stats_inflight = asyncio.create_task(_fetch_stats())
+    # Shielded so one cancelled request doesn't fail the others
+    return await asyncio.shield(_stats_inflight)
+
+
+def invalidate_stats_cache() -> None:
+    """Make the next get_cached_stats() read the database"""
+    global _stats_inflight
+    _stats_cache["val"] = None
+    _stats_cache["gen"] += 1
+    # A read already in flight may predate the write; later callers start
+    # a fresh one (current waiters still get the older result)
+    _stats_inflight = None
+
+
+# Short random ids, drawn from one os.urandom() call per 256 ids
+_ID_POOL: deque = deque()
+_ID_LOCK = threading.Lock()
+
+
+def fresh_id() -> str:
+    """Return 8 random hex characters for use in resource ids"""
+    with _ID_LOCK:
+        if not _ID_POOL:
+            blob = os.urandom(4 * 256)
+            _ID_POOL.extend(blob[i:i + 4].hex() for i in range(0, len(blob), 4))
+        return _ID_POOL.popleft()
+
+
 # ============================================================================
 # Code Review Patterns
 # ============================================================================
@@ -314,42 +759,162 @@ def analyze_code(code: str, language: str, assistants: List[str]) -> List[Findin
     return findings
 
 
+# Re-reviews of the same snippet (fix iterations, frontend retries) are
+# common; keep the most recent results keyed by a digest of the code.
+_ANALYZE_CACHE: "OrderedDict[tuple, List[Finding]]" = OrderedDict()
+_ANALYZE_CACHE_MAX = 512
+_ANALYZE_CACHE_MIN_CHARS = 256  # shorter snippets are cheaper to rescan
+_ANALYZE_CACHE_LOCK = threading.Lock()  # review_code_ai analyzes off the event loop
+
+
+def analyze_code_cached(code: str, language: str, assistants: List[str]) -> List[Finding]:
+    """analyze_code with an LRU cache; the returned list must not be mutated"""
+    if len(code) < _ANALYZE_CACHE_MIN_CHARS:
+        return analyze_code(code, language, assistants)
+
+    key = (hashlib.blake2b(code.encode(), digest_size=16).digest(), language, tuple(assistants))
+    with _ANALYZE_CACHE_LOCK:
+        hit = _ANALYZE_CACHE.get(key)
+        if hit is not None:
+            _ANALYZE_CACHE.move_to_end(key)
+            return hit
+
+    findings = analyze_code(code, language, assistants)
+    with _ANALYZE_CACHE_LOCK:
+        _ANALYZE_CACHE[key] = findings
+        if len(_ANALYZE_CACHE) > _ANALYZE_CACHE_MAX:
+            _ANALYZE_CACHE.popitem(last=False)
+    return findings
+
+
 # ============================================================================
 # Assistant Loader
 # ============================================================================
 
+# (directory, pattern) -> (directory mtime, matches)
+_GLOB_CACHE: Dict[tuple, tuple] = {}
+
+
+def _cached_glob(root: Path, pattern: str) -> List[Path]:
+    """Glob root, reusing the last result until the directory changes"""
+    mtime = root.stat().st_mtime
+    key = (root, pattern)
+    hit = _GLOB_CACHE.get(key)
+    if hit and hit[0] == mtime:
+        return hit[1]
+    files = list(root.glob(pattern))
+    _GLOB_CACHE[key] = (mtime, files)
+    return files
+
+
+# Assistant modules that are not real assistants
+_EXCLUDED_ASSISTANT_FILES = {"assistants_enhanced_example.py"}
+_RESERVED_ASSISTANT_ATTRS = frozenset({"name", "version", "generate_finding"})
+
+
+def _assistant_methods(assistant: Any) -> List[Dict]:
+    """Public methods of an assistant, as listed by /api/assistants/{id}"""
+    methods = []
+    for name in dir(assistant):
+        if not name.startswith("_") and name not in _RESERVED_ASSISTANT_ATTRS:
+            method = getattr(assistant, name)
+            if callable(method):
+                methods.append({
+                    "name": name,
+                    "doc": method.__doc__[:100] if method.__doc__ else None
+                })
+    return methods
+
+
+def _assistant_patterns(assistant: Any) -> Tuple[Dict[str, Callable], Set[str]]:
+    """Public methods of an assistant: those callable without arguments, and
+    the names of those that require some"""
+    patterns = {}
+    needs_args = set()
+    for name in dir(assistant):
+        if name.startswith("_"):
+            continue
+        method = getattr(assistant, name)
+        if not callable(method):
+            continue
+        try:
+            params = inspect.signature(method).parameters.values()
+        except (TypeError, ValueError):
+            continue
+        if not all(p.default is not p.empty or p.kind in (p.VAR_POSITIONAL, p.VAR_KEYWORD) for p in params):
+            needs_args.add(name)
+        elif name not in _RESERVED_ASSISTANT_ATTRS:
+            patterns[name] = method
+    return patterns, needs_args
+
+
 def load_assistants():
     """Load all enhanced assistants"""
     genesis_path = Path(__file__).parent.parent
+    files = [
+        f for f in _cached_glob(genesis_path, "assistants_enhanced_*.py")
+        if f.name not in _EXCLUDED_ASSISTANT_FILES
+    ]
 
-    for file in genesis_path.glob("assistants_enhanced_*.py"):
-        if file.name == "assistants_enhanced_example.py":
-            continue
-
+    for file in files:
         module_name = file.stem
         try:
             spec = importlib.util.spec_from_file_location(module_name, file)
             module = importlib.util.module_from_spec(spec)
             spec.loader.exec_module(module)
 
-            for name in dir(module):
-                if name.startswith("create_enhanced_"):
-                    factory = getattr(module, name)
-                    if callable(factory):
-                        try:
-                            config = factory()
-                            if isinstance(config, dict) and "name" in config:
-                                assistant_key = module_name.replace("assistants_enhanced_", "")
-                                state.assistant_configs[assistant_key] = config
-
-                                if "assistant_class" in config:
-                                    state.assistants[assistant_key] = config["assistant_class"]()
-                                break
-                        except Exception:
-                            continue
+            # Most modules follow create_enhanced_<key>_assistant; only scan
+            # the module namespace for the ones that don't
+            assistant_key = module_name.replace("assistants_enhanced_", "")
+            factory = getattr(module, f"create_enhanced_{assistant_key}_assistant", None)
+            if callable(factory):
+                factories = [factory]
+            else:
+                factories = [getattr(module, name) for name in dir(module) if name.startswith("create_enhanced_")]
+
+            for factory in factories:
+                if callable(factory):
+                    try:
+                        config = factory()
+                        if isinstance(config, dict) and "name" in config:
+                            state.assistant_configs[assistant_key] = config
+
+                            if "assistant_class" in config:
+                                state.assistants[assistant_key] = config["assistant_class"]()
+                            break
+                    except Exception:
+                        continue
         except Exception as e:
             print(f"Warning: Could not load {module_name}: {e}")
 
+    assistant_list = []
+    state.assistant_detail_json = {}
+    for key, config in state.assistant_configs.items():
+        assistant = state.assistants.get(key)
+        methods = _assistant_methods(assistant) if assistant else []
+        assistant_list.append({
+            "id": key,
+            "name": config.get("name", key),
+            "domain": config.get("domain", "general"),
+            "tags": config.get("tags", [])[:5],
+            "description": config.get("system_prompt", "")[:200],
+            "methods_count": len(methods)
+        })
+        state.assistant_detail_json[key] = orjson.dumps({
+            "id": key,
+            "name": config.get("name", key),
+            "domain": config.get("domain", "general"),
+            "tags": config.get("tags", []),
+            "system_prompt": config.get("system_prompt", "")[:500],
+            "methods": methods
+        })
+    state.assistant_list_json = orjson.dumps(assistant_list)
+    state.assistant_patterns = {}
+    state.assistant_arg_methods = {}
+    for key, assistant in state.assistants.items():
+        state.assistant_patterns[key], state.assistant_arg_methods[key] = _assistant_patterns(assistant)
+    state.assistant_pattern_json = {}
+
     print(f"Loaded {len(state.assistants)} assistants")
 
 
@@ -357,6 +922,23 @@ def load_assistants():
 # Lifespan Management
 # ============================================================================
 
+PROVISION_SECONDS = 3  # Simulated provisioning time
+
+
+async def provision_reaper():
+    """Mark factories active once provisioning time has elapsed
+
+    One periodic task with a batched UPDATE, instead of a sleeping
+    coroutine per created factory.
+    """
+    while True:
+        await asyncio.sleep(1)
+        try:
+            if db.mark_provisioned_older_than(PROVISION_SECONDS):
+                invalidate_stats_cache()
+        except Exception as e:
+            print(f"Provision reaper error: {e}")
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Manage application lifespan"""
@@ -390,9 +972,16 @@ async def lifespan(app: FastAPI):
         db.update_factory("demo-healthcare", features_built=45, status="active")
         db.update_factory("demo-ecommerce", features_built=32, status="active")
 
+    reaper = asyncio.create_task(provision_reaper())
+    await manager.start()
+
     yield
 
     print("Genesis API Server shutting down...")
+    reaper.cancel()
+    await manager.stop()
+    await ANTHROPIC_CLIENT.aclose()
+    db.close_connections()
 
 
 # ============================================================================
@@ -403,15 +992,20 @@ app = FastAPI(
     title="Genesis Engine API",
     description="Factory-as-a-Service Platform API",
     version="2.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
+# Comma-separated list of dashboard origins; "*" (the default) allows any
+ALLOWED_ORIGINS = [o.strip() for o in os.environ.get("ALLOWED_ORIGINS", "*").split(",") if o.strip()]
+
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],
+    allow_origins=ALLOWED_ORIGINS,
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=["GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"],
+    allow_headers=["Content-Type", "Authorization"],
+    max_age=86400,
 )
 
 
@@ -422,31 +1016,35 @@ app.add_middleware(
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
-    stats = db.get_stats()
-    return {
+    stats = await get_cached_stats()
+    return Response(orjson.dumps({
         "status": "healthy",
         "timestamp": datetime.utcnow().isoformat(),
         "assistants_loaded": len(state.assistants),
         "factories_active": stats["active_factories"],
         "total_reviews": stats["total_reviews"]
+    }), media_type="application/json")
+
+
+# Static, so serialized once at import
+_ROOT_BODY = orjson.dumps({
+    "name": "Genesis Engine API",
+    "version": "2.0.0",
+    "docs": "/docs",
+    "endpoints": {
+        "factories": "/api/factories",
+        "assistants": "/api/assistants",
+        "review": "/api/review",
+        "stats": "/api/stats",
+        "websocket": "/ws/{room_id}"
     }
+})
 
 
 @app.get("/")
 async def root():
     """Root endpoint"""
-    return {
-        "name": "Genesis Engine API",
-        "version": "2.0.0",
-        "docs": "/docs",
-        "endpoints": {
-            "factories": "/api/factories",
-            "assistants": "/api/assistants",
-            "review": "/api/review",
-            "stats": "/api/stats",
-            "websocket": "/ws/{room_id}"
-        }
-    }
+    return Response(_ROOT_BODY, media_type="application/json")
 
 
 # ============================================================================
@@ -461,30 +1059,24 @@ async def list_factories():
 
 
 @app.post("/api/factories")
-async def create_factory(request: FactoryCreate, background_tasks: BackgroundTasks):
+async def create_factory(request: FactoryCreate):
     """Create a new factory"""
-    factory_id = f"factory-{uuid.uuid4().hex[:8]}"
+    factory_id = f"factory-{fresh_id()}"
 
+    # Starts out provisioning; the lifespan reaper flips it to active
     factory = db.create_factory(
         id=factory_id,
         name=request.name,
         domain=request.domain,
         description=request.description,
         assistants=request.assistants,
+        status="provisioning",
     )
-
-    # Simulate provisioning in background
-    background_tasks.add_task(provision_factory, factory_id)
+    invalidate_stats_cache()
 
     return factory
 
 
-async def provision_factory(factory_id: str):
-    """Background task to provision a factory"""
-    await asyncio.sleep(3)  # Simulate provisioning
-    db.update_factory(factory_id, status="active")
-
-
 @app.get("/api/factories/{factory_id}")
 async def get_factory(factory_id: str):
     """Get factory by ID"""
@@ -495,11 +1087,12 @@ async def get_factory(factory_id: str):
 
 
 @app.patch("/api/factories/{factory_id}")
-async def update_factory(factory_id: str, updates: Dict[str, Any]):
+async def update_factory(factory_id: str, updates: FactoryUpdate):
     """Update factory"""
-    factory = db.update_factory(factory_id, **updates)
+    factory = db.update_factory(factory_id, **updates.model_dump(exclude_none=True))
     if not factory:
         raise HTTPException(status_code=404, detail="Factory not found")
+    invalidate_stats_cache()
     return factory
 
 
@@ -510,6 +1103,7 @@ async def delete_factory(factory_id: str):
     db.delete_setup_tasks_for_factory(factory_id)
     if not db.delete_factory(factory_id):
         raise HTTPException(status_code=404, detail="Factory not found")
+    invalidate_stats_cache()
     return {"status": "deleted", "id": factory_id}
 
 
@@ -559,31 +1153,208 @@ class GenerateSetupRequest(BaseModel):
     plan: Dict[str, Any]
 
 
+# Static tasks are built once; the db layer prefixes keys with the factory id
+_HIPAA_TASK = db.SetupTaskDraft(
+    key="compliance-hipaa",
+    category="compliance",
+    title="HIPAA Compliance Setup",
+    description="Configure HIPAA-compliant data handling, encryption, and audit logging",
+)
+
+_PCI_TASK = db.SetupTaskDraft(
+    key="compliance-pci",
+    category="compliance",
+    title="PCI-DSS Compliance Setup",
+    description="Set up secure payment processing environment and data isolation",
+)
+
+_GDPR_TASK = db.SetupTaskDraft(
+    key="compliance-gdpr",
+    category="compliance",
+    title="GDPR Compliance Setup",
+    description="Implement data consent, right to deletion, and data export features",
+)
+
+_STRIPE_TASK = db.SetupTaskDraft(
+    key="int-stripe",
+    category="credentials",
+    title="Configure Stripe API Keys",
+    description="Create Stripe account and add API keys to environment",
+    task_type="external",
+    action_url="https://dashboard.stripe.com/apikeys",
+    metadata={"env_vars": ["STRIPE_PUBLIC_KEY", "STRIPE_SECRET_KEY"]},
+)
+
+_AUTH_TASK = db.SetupTaskDraft(
+    key="int-auth",
+    category="credentials",
+    title="Configure Authentication Provider",
+    description="Set up OAuth/authentication provider and add credentials",
+    task_type="external",
+    metadata={"env_vars": ["AUTH_CLIENT_ID", "AUTH_CLIENT_SECRET"]},
+)
+
+_AWS_TASK = db.SetupTaskDraft(
+    key="int-aws",
+    category="credentials",
+    title="Configure AWS Credentials",
+    description="Set up AWS IAM user and add credentials for S3, Lambda, etc.",
+    task_type="external",
+    action_url="https://console.aws.amazon.com/iam/",
+    metadata={"env_vars": ["AWS_ACCESS_KEY_ID", "AWS_SECRET_ACCESS_KEY", "AWS_REGION"]},
+)
+
+_ENV_TASK = db.SetupTaskDraft(
+    key="config-env",
+    category="configuration",
+    title="Create Environment File",
+    description="Create .env file with all required environment variables",
+)
+
+_VERIFY_TASK = db.SetupTaskDraft(
+    key="config-verify",
+    category="configuration",
+    title="Verify Setup Complete",
+    description="Run health checks and verify all systems are connected",
+    task_type="automated",
+    action_command="npm run verify",
+)
+
+_DATABASE_ENV_VARS = {"env_vars": ["DATABASE_URL"]}
+_EMAIL_ENV_VARS = {"env_vars": ["EMAIL_API_KEY", "EMAIL_FROM_ADDRESS"]}
+
+
+def _hipaa_task(compliance: str) -> db.SetupTaskDraft:
+    return _HIPAA_TASK
+
+
+def _pci_task(compliance: str) -> db.SetupTaskDraft:
+    return _PCI_TASK
+
+
+def _gdpr_task(compliance: str) -> db.SetupTaskDraft:
+    return _GDPR_TASK
+
+
+def _stripe_task(integration: str) -> db.SetupTaskDraft:
+    return _STRIPE_TASK
+
+
+def _auth_task(integration: str) -> db.SetupTaskDraft:
+    return _AUTH_TASK
+
+
+def _aws_task(integration: str) -> db.SetupTaskDraft:
+    return _AWS_TASK
+
+
+def _database_task(integration: str) -> db.SetupTaskDraft:
+    return db.SetupTaskDraft(
+        key="int-db-ext",
+        category="credentials",
+        title="Configure Database Connection",
+        description=f"Set up connection string for {integration}",
+        metadata=_DATABASE_ENV_VARS,
+    )
+
+
+def _email_task(integration: str) -> db.SetupTaskDraft:
+    return db.SetupTaskDraft(
+        key="int-email",
+        category="credentials",
+        title="Configure Email Service",
+        description=f"Set up email provider ({integration}) API keys",
+        task_type="external",
+        required=False,
+        metadata=_EMAIL_ENV_VARS,
+    )
+
+
+def _generic_integration_task(integration: str) -> db.SetupTaskDraft:
+    return db.SetupTaskDraft(
+        key=f"int-{integration.lower().replace(' ', '-')[:20]}",
+        category="integration",
+        title=f"Set Up {integration}",
+        description=f"Configure integration with {integration}",
+        required=False,
+    )
+
+
+class KeywordDispatch:
+    """Keyword -> task builder table, matched in one compiled pass
+
+    Entries are in precedence order (first listed wins when several
+    keywords occur). Keywords are lowercase and match case-insensitively
+    as substrings, so "PostgreSQL" and "Stripe/Payments" still route. The
+    lookahead reports a hit at every offset, so a single findall sees
+    every keyword occurrence; a plain search() would only return the
+    leftmost one.
+    """
+
+    def __init__(self, *entries):
+        self.entries = entries
+        self._pattern = re.compile(
+            "(?=(" + "|".join(re.escape(kw) for kw, _ in entries) + "))", re.IGNORECASE
+        )
+        self._ranks = {kw: rank for rank, (kw, _) in enumerate(entries)}
+
+    def match(self, text: str):
+        """Return the highest-precedence builder whose keyword occurs in text"""
+        hits = self._pattern.findall(text)
+        if not hits:
+            return None
+        return self.entries[min(self._ranks[kw.lower()] for kw in hits)][1]
+
+
+INTEGRATION_DISPATCH = KeywordDispatch(
+    # Payment providers
+    ("stripe", _stripe_task), ("payment", _stripe_task), ("billing", _stripe_task),
+    # Auth providers
+    ("auth0", _auth_task), ("authentication", _auth_task), ("oauth", _auth_task),
+    # AWS
+    ("aws", _aws_task), ("s3", _aws_task),
+    # Database services
+    ("postgres", _database_task), ("mysql", _database_task),
+    ("mongodb", _database_task), ("database", _database_task),
+    # Email services
+    ("email", _email_task), ("sendgrid", _email_task), ("mailgun", _email_task), ("ses", _email_task),
+)
+
+COMPLIANCE_DISPATCH = KeywordDispatch(
+    ("hipaa", _hipaa_task), ("pci", _pci_task), ("gdpr", _gdpr_task),
+)
+
+
 @app.get("/api/factories/{factory_id}/setup")
 async def get_factory_setup_tasks(factory_id: str):
     """Get all setup tasks for a factory"""
-    factory = db.get_factory(factory_id)
-    if not factory:
+    progress = db.get_setup_progress(factory_id)
+    if progress is None:
         raise HTTPException(status_code=404, detail="Factory not found")
 
-    tasks = db.get_setup_tasks_for_factory(factory_id)
-    progress = db.get_setup_progress(factory_id)
+    # Progress is computed up front, so tasks can be streamed row by row
+    # without holding the whole list (and its encoded form) in memory.
+    # A plain generator: StreamingResponse advances it in the threadpool,
+    # keeping the blocking reads off the event loop.
+    def body():
+        yield b'{"factory_id":' + orjson.dumps(factory_id) + b',"tasks":['
+        sep = b""
+        for task in db.iter_setup_tasks_for_factory(factory_id):
+            yield sep + orjson.dumps(task)
+            sep = b","
+        yield b'],"progress":' + orjson.dumps(progress) + b"}"
 
-    return {
-        "factory_id": factory_id,
-        "tasks": tasks,
-        "progress": progress
-    }
+    return StreamingResponse(body(), media_type="application/json")
 
 
 @app.get("/api/factories/{factory_id}/setup/progress", response_model=SetupProgress)
 async def get_factory_setup_progress(factory_id: str):
     """Get setup progress for a factory"""
-    factory = db.get_factory(factory_id)
-    if not factory:
+    progress = db.get_setup_progress(factory_id)
+    if progress is None:
         raise HTTPException(status_code=404, detail="Factory not found")
 
-    return db.get_setup_progress(factory_id)
+    return progress
 
 
 @app.patch("/api/factories/{factory_id}/setup/{task_id}")
@@ -593,7 +1364,7 @@ async def update_setup_task(factory_id: str, task_id: str, update: SetupTaskUpda
     if not task or task["factory_id"] != factory_id:
         raise HTTPException(status_code=404, detail="Task not found")
 
-    updates = {k: v for k, v in update.model_dump().items() if v is not None}
+    updates = update.model_dump(exclude_none=True)
     updated_task = db.update_setup_task(task_id, **updates)
 
     return updated_task
@@ -602,226 +1373,62 @@ async def update_setup_task(factory_id: str, task_id: str, update: SetupTaskUpda
 @app.post("/api/factories/{factory_id}/setup/generate")
 async def generate_setup_tasks(factory_id: str, request: GenerateSetupRequest):
     """Generate setup tasks from a factory plan"""
-    factory = db.get_factory(factory_id)
-    if not factory:
-        raise HTTPException(status_code=404, detail="Factory not found")
-
-    # Delete any existing setup tasks for this factory
-    db.delete_setup_tasks_for_factory(factory_id)
-
     plan = request.plan
-    tasks_created = []
-    order = 0
+    architecture = plan.get("architecture") or ""
+    data_models = plan.get("data_models") or []
+    compliance = plan.get("compliance") or []
+    integrations = plan.get("integrations") or []
+    security = plan.get("security_considerations") or []
+    tasks = []
 
     # Infrastructure tasks based on architecture
-    architecture = plan.get("architecture", "")
     if architecture:
-        tasks_created.append(db.create_setup_task(
-            id=f"{factory_id}-infra-arch",
-            factory_id=factory_id,
+        tasks.append(db.SetupTaskDraft(
+            key="infra-arch",
             category="infrastructure",
             title="Review Architecture Design",
             description=f"Review and confirm the recommended architecture: {architecture}",
-            task_type="manual",
-            required=True,
-            order_index=order
         ))
-        order += 1
 
     # Database setup
-    data_models = plan.get("data_models", [])
     if data_models:
-        tasks_created.append(db.create_setup_task(
-            id=f"{factory_id}-infra-db",
-            factory_id=factory_id,
+        tasks.append(db.SetupTaskDraft(
+            key="infra-db",
             category="infrastructure",
             title="Set Up Database",
             description=f"Create database and tables for: {', '.join(data_models[:5])}",
-            task_type="manual",
-            required=True,
-            order_index=order,
-            metadata={"data_models": data_models}
+            metadata={"data_models": data_models},
         ))
-        order += 1
 
     # Compliance-specific tasks
-    compliance = plan.get("compliance", [])
     for comp in compliance:
-        comp_lower = comp.lower()
-        if "hipaa" in comp_lower:
-            tasks_created.append(db.create_setup_task(
-                id=f"{factory_id}-compliance-hipaa",
-                factory_id=factory_id,
-                category="compliance",
-                title="HIPAA Compliance Setup",
-                description="Configure HIPAA-compliant data handling, encryption, and audit logging",
-                task_type="manual",
-                required=True,
-                order_index=order
-            ))
-            order += 1
-        elif "pci" in comp_lower:
-            tasks_created.append(db.create_setup_task(
-                id=f"{factory_id}-compliance-pci",
-                factory_id=factory_id,
-                category="compliance",
-                title="PCI-DSS Compliance Setup",
-                description="Set up secure payment processing environment and data isolation",
-                task_type="manual",
-                required=True,
-                order_index=order
-            ))
-            order += 1
-        elif "gdpr" in comp_lower:
-            tasks_created.append(db.create_setup_task(
-                id=f"{factory_id}-compliance-gdpr",
-                factory_id=factory_id,
-                category="compliance",
-                title="GDPR Compliance Setup",
-                description="Implement data consent, right to deletion, and data export features",
-                task_type="manual",
-                required=True,
-                order_index=order
-            ))
-            order += 1
+        builder = COMPLIANCE_DISPATCH.match(comp)
+        if builder:
+            tasks.append(builder(comp))
 
     # Integration-specific tasks
-    integrations = plan.get("integrations", [])
     for integration in integrations:
-        int_lower = integration.lower()
-
-        # Payment providers
-        if any(p in int_lower for p in ["stripe", "payment", "billing"]):
-            tasks_created.append(db.create_setup_task(
-                id=f"{factory_id}-int-stripe",
-                factory_id=factory_id,
-                category="credentials",
-                title="Configure Stripe API Keys",
-                description="Create Stripe account and add API keys to environment",
-                task_type="external",
-                action_url="https://dashboard.stripe.com/apikeys",
-                required=True,
-                order_index=order,
-                metadata={"env_vars": ["STRIPE_PUBLIC_KEY", "STRIPE_SECRET_KEY"]}
-            ))
-            order += 1
-
-        # Auth providers
-        elif any(p in int_lower for p in ["auth0", "authentication", "oauth"]):
-            tasks_created.append(db.create_setup_task(
-                id=f"{factory_id}-int-auth",
-                factory_id=factory_id,
-                category="credentials",
-                title="Configure Authentication Provider",
-                description="Set up OAuth/authentication provider and add credentials",
-                task_type="external",
-                required=True,
-                order_index=order,
-                metadata={"env_vars": ["AUTH_CLIENT_ID", "AUTH_CLIENT_SECRET"]}
-            ))
-            order += 1
-
-        # AWS
-        elif "aws" in int_lower or "s3" in int_lower:
-            tasks_created.append(db.create_setup_task(
-                id=f"{factory_id}-int-aws",
-                factory_id=factory_id,
-                category="credentials",
-                title="Configure AWS Credentials",
-                description="Set up AWS IAM user and add credentials for S3, Lambda, etc.",
-                task_type="external",
-                action_url="https://console.aws.amazon.com/iam/",
-                required=True,
-                order_index=order,
-                metadata={"env_vars": ["AWS_ACCESS_KEY_ID", "AWS_SECRET_ACCESS_KEY", "AWS_REGION"]}
-            ))
-            order += 1
-
-        # Database services
-        elif any(p in int_lower for p in ["postgres", "mysql", "mongodb", "database"]):
-            tasks_created.append(db.create_setup_task(
-                id=f"{factory_id}-int-db-ext",
-                factory_id=factory_id,
-                category="credentials",
-                title=f"Configure Database Connection",
-                description=f"Set up connection string for {integration}",
-                task_type="manual",
-                required=True,
-                order_index=order,
-                metadata={"env_vars": ["DATABASE_URL"]}
-            ))
-            order += 1
-
-        # Email services
-        elif any(p in int_lower for p in ["email", "sendgrid", "mailgun", "ses"]):
-            tasks_created.append(db.create_setup_task(
-                id=f"{factory_id}-int-email",
-                factory_id=factory_id,
-                category="credentials",
-                title="Configure Email Service",
-                description=f"Set up email provider ({integration}) API keys",
-                task_type="external",
-                required=False,
-                order_index=order,
-                metadata={"env_vars": ["EMAIL_API_KEY", "EMAIL_FROM_ADDRESS"]}
-            ))
-            order += 1
-
-        # Generic integration
-        else:
-            tasks_created.append(db.create_setup_task(
-                id=f"{factory_id}-int-{integration.lower().replace(' ', '-')[:20]}",
-                factory_id=factory_id,
-                category="integration",
-                title=f"Set Up {integration}",
-                description=f"Configure integration with {integration}",
-                task_type="manual",
-                required=False,
-                order_index=order
-            ))
-            order += 1
+        builder = INTEGRATION_DISPATCH.match(integration)
+        tasks.append((builder or _generic_integration_task)(integration))
 
     # Security tasks based on recommendations
-    security = plan.get("security_considerations", [])
     if security:
-        tasks_created.append(db.create_setup_task(
-            id=f"{factory_id}-security-review",
-            factory_id=factory_id,
+        tasks.append(db.SetupTaskDraft(
+            key="security-review",
             category="configuration",
             title="Security Configuration Review",
             description="Review and implement security considerations: " + "; ".join(security[:3]),
-            task_type="manual",
-            required=True,
-            order_index=order,
-            metadata={"considerations": security}
+            metadata={"considerations": security},
         ))
-        order += 1
-
-    # Environment setup
-    tasks_created.append(db.create_setup_task(
-        id=f"{factory_id}-config-env",
-        factory_id=factory_id,
-        category="configuration",
-        title="Create Environment File",
-        description="Create .env file with all required environment variables",
-        task_type="manual",
-        required=True,
-        order_index=order
-    ))
-    order += 1
-
-    # Final verification
-    tasks_created.append(db.create_setup_task(
-        id=f"{factory_id}-config-verify",
-        factory_id=factory_id,
-        category="configuration",
-        title="Verify Setup Complete",
-        description="Run health checks and verify all systems are connected",
-        task_type="automated",
-        action_command="npm run verify",
-        required=True,
-        order_index=order
-    ))
+
+    # Environment setup and final verification
+    tasks.append(_ENV_TASK)
+    tasks.append(_VERIFY_TASK)
+
+    # Replace existing tasks and insert the new set in one transaction
+    tasks_created = db.create_setup_tasks_bulk(factory_id, tasks)
+    if tasks_created is None:
+        raise HTTPException(status_code=404, detail="Factory not found")
 
     return {
         "factory_id": factory_id,
@@ -837,31 +1444,27 @@ async def generate_setup_tasks(factory_id: str, request: GenerateSetupRequest):
 @app.post("/api/review", response_model=CodeReviewResponse)
 async def review_code(request: CodeReviewRequest):
     """Review code using pattern matching"""
-    review_id = f"review-{uuid.uuid4().hex[:8]}"
+    review_id = f"review-{fresh_id()}"
 
     # Run pattern analysis
-    findings = analyze_code(request.code, request.language, request.assistants)
+    findings = analyze_code_cached(request.code, request.language, request.assistants)
 
     # Calculate summary
-    summary = {"critical": 0, "high": 0, "medium": 0, "low": 0}
-    for finding in findings:
-        if finding.severity in summary:
-            summary[finding.severity] += 1
+    summary = severity_summary(findings)
 
     # Save to database
-    db.create_review(
+    await asyncio.to_thread(
+        db.create_review,
         id=review_id,
         file_name=request.file_name,
-        code_snippet=request.code[:1000],  # First 1000 chars
-        findings=[f.model_dump() for f in findings],
+        code_snippet=request.code[:SNIPPET_CHARS],
+        findings=[f.as_dict() for f in findings],
         assistants_used=request.assistants,
         factory_id=request.factory_id,
         language=request.language,
+        increment_features=True,
     )
-
-    # Increment factory features if associated
-    if request.factory_id:
-        db.increment_features(request.factory_id)
+    invalidate_stats_cache()
 
     return CodeReviewResponse(
         review_id=review_id,
@@ -874,76 +1477,40 @@ async def review_code(request: CodeReviewRequest):
     )
 
 
-@app.post("/api/review/ai", response_model=CodeReviewResponse)
-async def review_code_ai(request: CodeReviewRequest):
-    """Review code using Claude AI for deeper analysis"""
-    api_key = get_api_key("anthropic_api_key")
-    if not api_key:
-        raise HTTPException(
-            status_code=503,
-            detail="AI review requires Anthropic API key. Configure it in Settings."
-        )
-
-    review_id = f"review-{uuid.uuid4().hex[:8]}"
-
-    # First run pattern analysis for quick wins
-    pattern_findings = analyze_code(request.code, request.language, request.assistants)
-
-    # Build AI prompt
-    assistant_context = ", ".join(request.assistants)
-    prompt = f"""You are an expert code reviewer specializing in {assistant_context}.
-
-Analyze this {request.language} code for issues related to: {assistant_context}
-
-CODE TO REVIEW:
-```{request.language}
-{request.code}
-```
-
-For each issue found, respond with a JSON array of findings. Each finding must have:
-- severity: "critical", "high", "medium", or "low"
-- title: Short title (max 50 chars)
-- description: What's wrong and why it matters
-- line: Line number where issue occurs (integer)
-- recommendation: How to fix it
-
-Focus on actionable, specific issues. Don't repeat the same issue multiple times.
-Return ONLY a valid JSON array, no other text."""
-
-    try:
-        import httpx
-
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                "https://api.anthropic.com/v1/messages",
-                headers={
-                    "x-api-key": api_key,
-                    "anthropic-version": "2023-06-01",
-                    "content-type": "application/json",
-                },
-                json={
-                    "model": get_ai_model(),
-                    "max_tokens": 2000,
-                    "messages": [{"role": "user", "content": prompt}]
-                },
-                timeout=30.0
-            )
+@app.post("/api/review/ai", response_model=CodeReviewResponse)
+async def review_code_ai(request: CodeReviewRequest):
+    """Review code using Claude AI for deeper analysis"""
+    api_key = get_api_key("anthropic_api_key")
+    if not api_key:
+        raise HTTPException(
+            status_code=503,
+            detail="AI review requires Anthropic API key. Configure it in Settings."
+        )
 
-        if response.status_code != 200:
-            raise HTTPException(status_code=502, detail=f"AI service error: {response.text}")
+    review_id = f"review-{fresh_id()}"
 
-        result = response.json()
-        ai_text = result["content"][0]["text"]
+    # Build AI prompt
+    assistant_context = ", ".join(request.assistants)
+    prompt = _REVIEW_PROMPT.format(
+        assistant_context=assistant_context,
+        language=request.language,
+        code=request.code[:MAX_PROMPT_CODE_CHARS],
+    )
 
-        # Parse AI response
-        import json as json_lib
-        # Extract JSON from response (handle markdown code blocks)
-        if "```json" in ai_text:
-            ai_text = ai_text.split("```json")[1].split("```")[0]
-        elif "```" in ai_text:
-            ai_text = ai_text.split("```")[1].split("```")[0]
+    # Start the AI call, then run pattern analysis on a worker thread while
+    # it is in flight
+    ai_task = asyncio.create_task(_anthropic_call(api_key, prompt, 2000, parse=_parse_json_reply))
+    try:
+        pattern_findings = await asyncio.to_thread(
+            analyze_code_cached, request.code, request.language, request.assistants
+        )
+    except BaseException:
+        # Don't leave the AI call running (and billed) for a failed request
+        ai_task.cancel()
+        raise
 
-        ai_findings_raw = json_lib.loads(ai_text.strip())
+    try:
+        ai_findings_raw = await ai_task
 
         # Convert to Finding objects
         ai_findings = []
@@ -959,38 +1526,46 @@ Return ONLY a valid JSON array, no other text."""
                 recommendation=f.get("recommendation")
             ))
 
-        # Combine pattern + AI findings (deduplicate by line/title)
-        seen = set()
-        all_findings = []
-        for f in pattern_findings + ai_findings:
-            key = (f.line, f.title[:20] if f.title else "")
-            if key not in seen:
-                seen.add(key)
-                all_findings.append(f)
-
-    except json_lib.JSONDecodeError:
+    except orjson.JSONDecodeError:
         # Fall back to pattern findings if AI parsing fails
-        all_findings = pattern_findings
+        ai_findings = []
     except Exception as e:
         print(f"AI review error: {e}")
-        all_findings = pattern_findings
+        ai_findings = []
 
-    # Calculate summary
-    summary = {"critical": 0, "high": 0, "medium": 0, "low": 0}
-    for finding in all_findings:
-        if finding.severity in summary:
-            summary[finding.severity] += 1
+    if not ai_findings:
+        # Pattern findings are already one per pattern; nothing to merge
+        all_findings = pattern_findings
+        summary = severity_summary(all_findings)
+    else:
+        # Combine pattern + AI findings (deduplicate by line/title) and
+        # tally severities in the same pass
+        seen = set()
+        all_findings = []
+        counts = [0, 0, 0, 0]
+        for f in chain(pattern_findings, ai_findings):
+            key = (f.line, f.title[:20] if f.title else "")
+            if key in seen:
+                continue
+            seen.add(key)
+            all_findings.append(f)
+            i = _SEV_IDX.get(f.severity)
+            if i is not None:
+                counts[i] += 1
+        summary = dict(zip(SEVERITIES, counts, strict=True))
 
     # Save to database
-    db.create_review(
+    await asyncio.to_thread(
+        db.create_review,
         id=review_id,
         file_name=request.file_name,
-        code_snippet=request.code[:1000],
-        findings=[f.model_dump() for f in all_findings],
+        code_snippet=request.code[:SNIPPET_CHARS],
+        findings=[f.as_dict() for f in all_findings],
         assistants_used=request.assistants + ["ai"],
         factory_id=request.factory_id,
         language=request.language,
     )
+    invalidate_stats_cache()
 
     return CodeReviewResponse(
         review_id=review_id,
@@ -1029,62 +1604,20 @@ async def generate_fix(request: FixRequest):
             detail="Fix generation requires Anthropic API key. Configure it in Settings."
         )
 
-    prompt = f"""You are an expert {request.language} developer. Fix the following code issue.
-
-ISSUE: {request.finding_title}
-DESCRIPTION: {request.finding_description}
-RECOMMENDATION: {request.recommendation}
-
-ORIGINAL CODE:
-```{request.language}
-{request.code}
-```
-
-Provide the FIXED code that resolves this issue. Only return the fixed code, no explanations.
-Return the complete fixed code wrapped in a code block."""
+    prompt = _FIX_PROMPT.format(
+        language=request.language,
+        finding_title=request.finding_title,
+        finding_description=request.finding_description,
+        recommendation=request.recommendation,
+        code=request.code,
+    )
 
     try:
-        import httpx
-
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                "https://api.anthropic.com/v1/messages",
-                headers={
-                    "x-api-key": api_key,
-                    "anthropic-version": "2023-06-01",
-                    "content-type": "application/json",
-                },
-                json={
-                    "model": get_ai_model(),
-                    "max_tokens": 2000,
-                    "messages": [{"role": "user", "content": prompt}]
-                },
-                timeout=30.0
-            )
-
-        if response.status_code != 200:
-            raise HTTPException(status_code=502, detail="AI service error")
-
-        result = response.json()
-        ai_text = result["content"][0]["text"]
-
-        # Extract code from response
-        fixed_code = ai_text
-        if "```" in ai_text:
-            # Extract code block
-            parts = ai_text.split("```")
-            if len(parts) >= 2:
-                code_block = parts[1]
-                # Remove language identifier if present
-                if code_block.startswith(request.language):
-                    code_block = code_block[len(request.language):].strip()
-                elif code_block.startswith("\n"):
-                    code_block = code_block.strip()
-                fixed_code = code_block
+        ai_text = await _anthropic_call(api_key, prompt, 2000)
 
         return FixResponse(
             original_code=request.code,
-            fixed_code=fixed_code.strip(),
+            fixed_code=_unfence(ai_text),
             explanation=f"Fixed: {request.finding_title}"
         )
 
@@ -1092,6 +1625,52 @@ Return the complete fixed code wrapped in a code block."""
         raise HTTPException(status_code=500, detail=f"Fix generation failed: {str(e)}")
 
 
+def _sse(event: str, data: Any) -> bytes:
+    """Encode one Server-Sent Event with a JSON payload"""
+    return b"event: " + event.encode() + b"\ndata: " + orjson.dumps(data) + b"\n\n"
+
+
+@app.post("/api/fix/stream")
+async def generate_fix_stream(request: FixRequest):
+    """Stream a generated fix as Server-Sent Events
+
+    "delta" events carry raw reply text as it arrives; a final "done" event
+    carries the same payload as /api/fix (or "error" if generation failed).
+    """
+    api_key = get_api_key("anthropic_api_key")
+    if not api_key:
+        raise HTTPException(
+            status_code=503,
+            detail="Fix generation requires Anthropic API key. Configure it in Settings."
+        )
+
+    prompt = _FIX_PROMPT.format(
+        language=request.language,
+        finding_title=request.finding_title,
+        finding_description=request.finding_description,
+        recommendation=request.recommendation,
+        code=request.code,
+    )
+
+    async def events():
+        parts = []
+        try:
+            async for text in _anthropic_stream(api_key, prompt, 2000):
+                parts.append(text)
+                yield _sse("delta", text)
+        except Exception as e:
+            yield _sse("error", {"detail": f"Fix generation failed: {str(e)}"})
+            return
+
+        yield _sse("done", {
+            "original_code": request.code,
+            "fixed_code": _unfence("".join(parts)),
+            "explanation": f"Fixed: {request.finding_title}",
+        })
+
+    return StreamingResponse(events(), media_type="text/event-stream")
+
+
 class PlanQuestion(BaseModel):
     """Interview question for factory planning"""
     id: str
@@ -1103,9 +1682,9 @@ class PlanQuestion(BaseModel):
 
 class FeatureSubPlan(BaseModel):
     """Detailed sub-plan for a feature"""
-    feature: str  # Feature name
-    description: str  # What this feature does
-    tasks: List[str]  # Implementation tasks
+    feature: str = ""  # Feature name
+    description: str = ""  # What this feature does
+    tasks: List[str] = []  # Implementation tasks
     components: List[str] = []  # UI components needed
     api_routes: List[str] = []  # API endpoints for this feature
     data_models: List[str] = []  # Database models needed
@@ -1132,11 +1711,11 @@ class FactoryPlan(BaseModel):
     name: str
     domain: str
     description: str
-    architecture: str
-    assistants: List[str]
-    features: List[str]
-    compliance: List[str]
-    integrations: List[str]
+    architecture: str = "VBD"
+    assistants: List[str] = Field(default_factory=lambda: ["security", "performance"])
+    features: List[str] = []
+    compliance: List[str] = []
+    integrations: List[str] = []
     data_models: List[str] = []
     api_endpoints: List[str] = []
     security_considerations: List[str] = []
@@ -1146,6 +1725,16 @@ class FactoryPlan(BaseModel):
     # Detailed sub-plans for each feature
     feature_plans: List[FeatureSubPlan] = []
 
+    @field_validator("ui_ux", mode="before")
+    @classmethod
+    def _empty_ui_ux(cls, v):
+        # The AI sometimes returns "ui_ux": {} - treat that as "not given"
+        return v or None
+
+
+# Validates a whole AI plan (with nested ui_ux / feature_plans) in one pass
+_FACTORY_PLAN_ADAPTER = TypeAdapter(FactoryPlan)
+
 
 class DesignReference(BaseModel):
     """Design reference URL or description"""
@@ -1210,80 +1799,26 @@ async def plan_factory(request: PlanRequest):
 
     # If no answers yet, generate interview questions
     if not request.answers:
-        question_prompt = f"""You are a software architect and UX designer helping plan a new project.
-
-The user wants to create a {request.domain} application called "{request.name}".
-Description: {request.description}{design_context}
-
-Generate 5-6 clarifying questions to understand their requirements better.
-Focus on:
-1. Key features they need (MULTISELECT - user can pick multiple)
-2. Compliance/security requirements (MULTISELECT)
-3. Integrations needed (MULTISELECT)
-4. Scale expectations
-5. UI/UX preferences (visual style, target audience, key user flows)
-6. Design system preferences (component library, responsive approach)
-
-Return a JSON array of questions. Each question must have exactly these fields:
-- id: unique string identifier (e.g., "features", "compliance", "ui_style")
-- question: the question text
-- context: brief context or why this matters
-- options: array of suggested answers (provide options for all questions to make selection easier)
-- multiselect: boolean - true if user can select multiple options, false for single choice
-
-IMPORTANT: For features, compliance, and integrations questions, set multiselect=true so users can select all that apply.
-
-Example format:
-[
-  {{"id": "features", "question": "What features do you need?", "context": "Select all that apply", "options": ["User Authentication", "Dashboard", "Payments", "Admin Panel", "API", "Notifications", "Reports", "Search"], "multiselect": true}},
-  {{"id": "compliance", "question": "What compliance requirements apply?", "context": "Select all that apply", "options": ["HIPAA", "PCI-DSS", "GDPR", "SOC2", "None"], "multiselect": true}},
-  {{"id": "integrations", "question": "What integrations do you need?", "context": "Select all that apply", "options": ["Stripe/Payments", "Auth0/OAuth", "Email (SendGrid)", "AWS/Cloud", "Database", "Analytics"], "multiselect": true}},
-  {{"id": "scale", "question": "Expected scale?", "context": "Affects architecture decisions", "options": ["Small (<1k users)", "Medium (1k-100k)", "Large (100k+)"], "multiselect": false}},
-  {{"id": "ui_style", "question": "What visual style fits your brand?", "context": "Influences component design", "options": ["Modern & Clean", "Playful & Colorful", "Corporate & Professional", "Minimal & Elegant"], "multiselect": false}}
-]
-
-Return ONLY valid JSON array, no other text."""
+        question_prompt = _QUESTION_PROMPT.format(
+            name=request.name,
+            domain=request.domain,
+            description=request.description,
+            design_context=design_context,
+        )
 
         try:
-            import httpx
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    "https://api.anthropic.com/v1/messages",
-                    headers={
-                        "x-api-key": api_key,
-                        "anthropic-version": "2023-06-01",
-                        "content-type": "application/json",
-                    },
-                    json={
-                        "model": get_ai_model(),
-                        "max_tokens": 1000,
-                        "messages": [{"role": "user", "content": question_prompt}]
-                    },
-                    timeout=30.0
+            questions_raw = await _anthropic_call(api_key, question_prompt, 1000, parse=_parse_json_reply)
+            questions = [
+                PlanQuestion(
+                    id=q.get("id", f"q{i}"),
+                    question=q.get("question", ""),
+                    context=q.get("context", ""),
+                    options=q.get("options"),
+                    multiselect=q.get("multiselect", False)
                 )
-
-            if response.status_code == 200:
-                result = response.json()
-                ai_text = result["content"][0]["text"]
-
-                import json as json_lib
-                if "```json" in ai_text:
-                    ai_text = ai_text.split("```json")[1].split("```")[0]
-                elif "```" in ai_text:
-                    ai_text = ai_text.split("```")[1].split("```")[0]
-
-                questions_raw = json_lib.loads(ai_text.strip())
-                questions = [
-                    PlanQuestion(
-                        id=q.get("id", f"q{i}"),
-                        question=q.get("question", ""),
-                        context=q.get("context", ""),
-                        options=q.get("options"),
-                        multiselect=q.get("multiselect", False)
-                    )
-                    for i, q in enumerate(questions_raw)
-                ]
-                return PlanResponse(status="questions", questions=questions)
+                for i, q in enumerate(questions_raw)
+            ]
+            return PlanResponse(status="questions", questions=questions)
         except Exception as e:
             print(f"Question generation error: {e}")
 
@@ -1303,169 +1838,34 @@ Return ONLY valid JSON array, no other text."""
     # Generate plan from answers
     answers_text = "\n".join([f"- {k}: {v}" for k, v in request.answers.items()])
 
-    # Available assistants/tools for reference
-    available_tools = """
-AVAILABLE ASSISTANTS & TOOLS:
-- security: Code security analysis, vulnerability detection, OWASP patterns
-- performance: Performance optimization, caching strategies, query optimization
-- accessibility: WCAG compliance, screen reader support, keyboard navigation
-- fhir: Healthcare FHIR data standards and HL7 compliance
-- hipaa: HIPAA compliance patterns, PHI handling, audit logging
-- pci_dss: Payment card security, tokenization, secure data handling
-- gdpr: Data privacy, consent management, right to deletion
-- sox: Financial audit trails, access controls
-- multitenancy: Multi-tenant architecture, data isolation, tenant management
-- iot: IoT protocols, device management, real-time data streams
-"""
-
-    plan_prompt = f"""You are a senior software architect and UX designer creating a DETAILED implementation plan.
-
-PROJECT: {request.name}
-DOMAIN: {request.domain}
-DESCRIPTION: {request.description}
-
-USER REQUIREMENTS:
-{answers_text}{design_context}
-
-{available_tools}
-
-Create a comprehensive factory plan with DETAILED sub-plans for EACH feature. Return a JSON object:
-{{
-    "name": "{request.name}",
-    "domain": "{request.domain}",
-    "description": "enhanced description based on requirements",
-    "architecture": "recommended architecture pattern with detailed explanation",
-    "assistants": ["relevant assistants from the available tools list above"],
-    "features": ["list of 5-10 features to build"],
-    "compliance": ["applicable compliance requirements"],
-    "integrations": ["external integrations needed"],
-    "data_models": ["key data entities/models"],
-    "api_endpoints": ["main API endpoints with methods: GET /api/users, POST /api/auth, etc."],
-    "security_considerations": ["security notes and recommendations"],
-    "estimated_complexity": "low" or "medium" or "high",
-    "ui_ux": {{
-        "style": "visual style",
-        "color_scheme": "recommended colors",
-        "target_audience": "who uses this",
-        "inspiration_urls": ["user-provided reference URLs"],
-        "key_pages": ["main pages/screens"],
-        "component_library": "recommended UI library",
-        "accessibility_level": "AA or AAA",
-        "responsive_priority": "mobile-first or desktop-first",
-        "special_requirements": ["dark mode", "RTL", etc.]
-    }},
-    "feature_plans": [
-        {{
-            "feature": "Feature Name",
-            "description": "What this feature does and why",
-            "tasks": ["Specific implementation task 1", "Task 2", "Task 3"],
-            "components": ["UI Component 1", "Component 2"],
-            "api_routes": ["POST /api/feature", "GET /api/feature/:id"],
-            "data_models": ["Model1", "Model2"],
-            "dependencies": ["Other features this depends on"],
-            "assistant_tools": ["Which assistants help: security, performance, etc."],
-            "estimated_effort": "low/medium/high"
-        }}
-    ]
-}}
-
-IMPORTANT: Create a feature_plan entry for EACH feature in the features list. Be specific about:
-- Exact implementation tasks (what code to write)
-- Which UI components are needed
-- Which API routes support this feature
-- Which data models are involved
-- Which assistant tools should review this feature
-
-Return ONLY valid JSON, no other text."""
+    plan_prompt = _PLAN_PROMPT.format(
+        name=request.name,
+        domain=request.domain,
+        description=request.description,
+        answers_text=answers_text,
+        design_context=design_context,
+    )
 
     try:
-        import httpx
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                "https://api.anthropic.com/v1/messages",
-                headers={
-                    "x-api-key": api_key,
-                    "anthropic-version": "2023-06-01",
-                    "content-type": "application/json",
-                },
-                json={
-                    "model": get_ai_model(),
-                    "max_tokens": 2000,
-                    "messages": [{"role": "user", "content": plan_prompt}]
-                },
-                timeout=30.0
-            )
+        plan_data = await _anthropic_call(api_key, plan_prompt, 2000, parse=_parse_json_reply)
 
-        if response.status_code == 200:
-            result = response.json()
-            ai_text = result["content"][0]["text"]
-
-            import json as json_lib
-            if "```json" in ai_text:
-                ai_text = ai_text.split("```json")[1].split("```")[0]
-            elif "```" in ai_text:
-                ai_text = ai_text.split("```")[1].split("```")[0]
-
-            plan_data = json_lib.loads(ai_text.strip())
-
-            # Parse UI/UX preferences if present
-            ui_ux_data = plan_data.get("ui_ux")
-            ui_ux = None
-            if ui_ux_data:
-                ui_ux = UIUXPreferences(
-                    style=ui_ux_data.get("style", "modern"),
-                    color_scheme=ui_ux_data.get("color_scheme", ""),
-                    target_audience=ui_ux_data.get("target_audience", ""),
-                    inspiration_urls=ui_ux_data.get("inspiration_urls", []),
-                    key_pages=ui_ux_data.get("key_pages", []),
-                    component_library=ui_ux_data.get("component_library", ""),
-                    accessibility_level=ui_ux_data.get("accessibility_level", "AA"),
-                    responsive_priority=ui_ux_data.get("responsive_priority", "mobile-first"),
-                    special_requirements=ui_ux_data.get("special_requirements", [])
-                )
-
-            # Parse feature plans if present
-            feature_plans = []
-            for fp in plan_data.get("feature_plans", []):
-                feature_plans.append(FeatureSubPlan(
-                    feature=fp.get("feature", ""),
-                    description=fp.get("description", ""),
-                    tasks=fp.get("tasks", []),
-                    components=fp.get("components", []),
-                    api_routes=fp.get("api_routes", []),
-                    data_models=fp.get("data_models", []),
-                    dependencies=fp.get("dependencies", []),
-                    assistant_tools=fp.get("assistant_tools", []),
-                    estimated_effort=fp.get("estimated_effort", "medium")
-                ))
-
-            plan = FactoryPlan(
-                name=plan_data.get("name", request.name),
-                domain=plan_data.get("domain", request.domain),
-                description=plan_data.get("description", request.description),
-                architecture=plan_data.get("architecture", "VBD"),
-                assistants=plan_data.get("assistants", ["security", "performance"]),
-                features=plan_data.get("features", []),
-                compliance=plan_data.get("compliance", []),
-                integrations=plan_data.get("integrations", []),
-                data_models=plan_data.get("data_models", []),
-                api_endpoints=plan_data.get("api_endpoints", []),
-                security_considerations=plan_data.get("security_considerations", []),
-                estimated_complexity=plan_data.get("estimated_complexity", "medium"),
-                ui_ux=ui_ux,
-                feature_plans=feature_plans
-            )
-            return PlanResponse(status="plan", plan=plan)
+        plan = _FACTORY_PLAN_ADAPTER.validate_python({
+            "name": request.name,
+            "domain": request.domain,
+            "description": request.description,
+            **plan_data,
+        })
+        return PlanResponse(status="plan", plan=plan)
 
     except Exception as e:
         print(f"Plan generation error: {e}")
 
     # Fallback plan
-    features = [f.strip() for f in request.answers.get("features", "").split(",") if f.strip()]
-    compliance = [c.strip() for c in request.answers.get("compliance", "").split(",") if c.strip()]
-    integrations = [i.strip() for i in request.answers.get("integrations", "").split(",") if i.strip()]
+    features = _split_csv(request.answers.get("features", ""))
+    compliance = _split_csv(request.answers.get("compliance", ""))
+    integrations = _split_csv(request.answers.get("integrations", ""))
     ui_style = request.answers.get("ui_style", "Modern & Clean")
-    key_pages = [p.strip() for p in request.answers.get("key_pages", "").split(",") if p.strip()]
+    key_pages = _split_csv(request.answers.get("key_pages", ""))
 
     return PlanResponse(
         status="plan",
@@ -1495,13 +1895,13 @@ Return ONLY valid JSON, no other text."""
 @app.get("/api/reviews")
 async def list_reviews(limit: int = 20):
     """Get recent reviews"""
-    return db.get_recent_reviews(limit)
+    return await asyncio.to_thread(db.get_recent_reviews, limit)
 
 
 @app.get("/api/reviews/{review_id}")
 async def get_review(review_id: str):
     """Get review by ID"""
-    review = db.get_review(review_id)
+    review = await asyncio.to_thread(db.get_review, review_id)
     if not review:
         raise HTTPException(status_code=404, detail="Review not found")
     return review
@@ -1514,79 +1914,54 @@ async def get_review(review_id: str):
 @app.get("/api/assistants")
 async def list_assistants():
     """List all available assistants"""
-    assistants = []
-
-    for key, config in state.assistant_configs.items():
-        methods_count = 0
-        if key in state.assistants:
-            assistant = state.assistants[key]
-            for name in dir(assistant):
-                if not name.startswith("_") and name not in ["name", "version", "generate_finding"]:
-                    if callable(getattr(assistant, name)):
-                        methods_count += 1
-
-        assistants.append({
-            "id": key,
-            "name": config.get("name", key),
-            "domain": config.get("domain", "general"),
-            "tags": config.get("tags", [])[:5],
-            "description": config.get("system_prompt", "")[:200],
-            "methods_count": methods_count
-        })
-
-    return assistants
+    return Response(content=state.assistant_list_json, media_type="application/json")
 
 
 @app.get("/api/assistants/{assistant_id}")
 async def get_assistant(assistant_id: str):
     """Get assistant details"""
-    if assistant_id not in state.assistant_configs:
+    body = state.assistant_detail_json.get(assistant_id)
+    if body is None:
         raise HTTPException(status_code=404, detail="Assistant not found")
+    return Response(content=body, media_type="application/json")
 
-    config = state.assistant_configs[assistant_id]
-    assistant = state.assistants.get(assistant_id)
-
-    methods = []
-    if assistant:
-        for name in dir(assistant):
-            if not name.startswith("_") and name not in ["name", "version", "generate_finding"]:
-                method = getattr(assistant, name)
-                if callable(method):
-                    methods.append({
-                        "name": name,
-                        "doc": method.__doc__[:100] if method.__doc__ else None
-                    })
 
-    return {
-        "id": assistant_id,
-        "name": config.get("name", assistant_id),
-        "domain": config.get("domain", "general"),
-        "tags": config.get("tags", []),
-        "system_prompt": config.get("system_prompt", "")[:500],
-        "methods": methods
-    }
+def _pattern_response(request: Request, body: bytes, etag: str) -> Response:
+    """Cached pattern body, or 304 when the client already has this ETag"""
+    headers = {"ETag": etag}
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        if etag in tags or "*" in tags:
+            return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
 
 
 @app.get("/api/assistants/{assistant_id}/patterns/{pattern_name}")
-async def get_assistant_pattern(assistant_id: str, pattern_name: str):
+async def get_assistant_pattern(assistant_id: str, pattern_name: str, request: Request):
     """Get specific pattern from assistant"""
-    if assistant_id not in state.assistants:
+    patterns = state.assistant_patterns.get(assistant_id)
+    if patterns is None:
         raise HTTPException(status_code=404, detail="Assistant not found")
 
-    assistant = state.assistants[assistant_id]
+    cached = state.assistant_pattern_json.get((assistant_id, pattern_name))
+    if cached is not None:
+        return _pattern_response(request, *cached)
 
-    if not hasattr(assistant, pattern_name):
+    method = patterns.get(pattern_name)
+    if method is None:
+        # Only public zero-argument methods are ever called from here
+        if pattern_name in state.assistant_arg_methods.get(assistant_id, ()):
+            raise HTTPException(status_code=400, detail="Method requires arguments")
         raise HTTPException(status_code=404, detail="Pattern not found")
 
-    method = getattr(assistant, pattern_name)
-    if not callable(method):
-        raise HTTPException(status_code=400, detail="Not a callable method")
+    result = method()
 
-    try:
-        result = method()
-        return {"pattern": pattern_name, "data": result}
-    except TypeError as e:
-        raise HTTPException(status_code=400, detail=f"Method requires arguments: {e}")
+    # Encoded exactly as FastAPI would, then kept for later requests
+    body = ORJSONResponse(jsonable_encoder({"pattern": pattern_name, "data": result})).body
+    etag = '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+    state.assistant_pattern_json[(assistant_id, pattern_name)] = (body, etag)
+    return _pattern_response(request, body, etag)
 
 
 # ============================================================================
@@ -1596,7 +1971,7 @@ async def get_assistant_pattern(assistant_id: str, pattern_name: str):
 @app.get("/api/stats")
 async def get_stats():
     """Get overall statistics"""
-    stats = db.get_stats()
+    stats = await get_cached_stats()
     return {
         "factories": {
             "total": stats["total_factories"],
@@ -1633,13 +2008,13 @@ class SettingsBatchUpdate(BaseModel):
 @app.get("/api/settings")
 async def get_all_settings():
     """Get all settings grouped by category"""
-    return db.get_all_settings()
+    return _cached_settings_view("all", db.get_all_settings)
 
 
 @app.get("/api/settings/status")
 async def get_settings_status():
     """Get configuration status (what's missing)"""
-    return db.get_settings_status()
+    return _cached_settings_view("status", db.get_settings_status)
 
 
 @app.get("/api/settings/category/{category}")
@@ -1648,7 +2023,7 @@ async def get_settings_by_category(category: str):
     valid_categories = ["ai", "integrations", "defaults", "ui"]
     if category not in valid_categories:
         raise HTTPException(status_code=400, detail=f"Invalid category. Must be one of: {valid_categories}")
-    return db.get_settings_by_category(category)
+    return _cached_settings_view("category", db.get_settings_by_category, category)
 
 
 @app.get("/api/settings/{key}")
@@ -1664,6 +2039,7 @@ async def get_setting(key: str):
 async def update_setting(key: str, request: SettingUpdate):
     """Update a single setting"""
     result = db.update_setting(key, request.value)
+    invalidate_settings_cache()
     if not result:
         raise HTTPException(status_code=404, detail="Setting not found")
     return result
@@ -1672,7 +2048,9 @@ async def update_setting(key: str, request: SettingUpdate):
 @app.put("/api/settings")
 async def update_settings_batch(request: SettingsBatchUpdate):
     """Update multiple settings at once"""
-    return db.update_settings_batch(request.settings)
+    result = db.update_settings_batch(request.settings)
+    invalidate_settings_cache()
+    return result
 
 
 @app.get("/api/settings/test/ai")
@@ -1683,22 +2061,16 @@ async def test_ai_connection():
         return {"status": "error", "message": "Anthropic API key not configured"}
 
     try:
-        import httpx
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                "https://api.anthropic.com/v1/messages",
-                headers={
-                    "x-api-key": api_key,
-                    "anthropic-version": "2023-06-01",
-                    "content-type": "application/json",
-                },
-                json={
-                    "model": get_ai_model(),
-                    "max_tokens": 10,
-                    "messages": [{"role": "user", "content": "Say hello"}]
-                },
-                timeout=10.0
-            )
+        response = await ANTHROPIC_CLIENT.post(
+            ANTHROPIC_URL,
+            headers={"x-api-key": api_key},
+            json={
+                "model": get_ai_model(),
+                "max_tokens": 10,
+                "messages": [{"role": "user", "content": "Say hello"}]
+            },
+            timeout=10.0
+        )
 
         if response.status_code == 200:
             return {"status": "ok", "message": "AI connection successful"}
@@ -1714,62 +2086,202 @@ async def test_ai_connection():
 # WebSocket - Real-time Collaboration
 # ============================================================================
 
+# Chat and cursor traffic can stamp many messages per millisecond; reuse
+# the formatted time instead of building a datetime for each one
+_ws_ts = [0, ""]
+
+
+def ws_timestamp() -> str:
+    """datetime.utcnow().isoformat(), at most once per millisecond"""
+    ms = time.time_ns() // 1_000_000
+    if ms != _ws_ts[0]:
+        _ws_ts[0] = ms
+        _ws_ts[1] = datetime.utcnow().isoformat()
+    return _ws_ts[1]
+
+
+async def send_ws(websocket: WebSocket, message: Dict):
+    """send_json, encoded with orjson (frames stay text)"""
+    await websocket.send_text(orjson.dumps(message).decode())
+
+
+# Optional Redis pub/sub so rooms can span several server workers. Each
+# worker still delivers to its own sockets; Redis only relays broadcasts.
+# Presence is not shared: room_state lists only this worker's users, and
+# users on other workers become visible through their join/leave events.
+REDIS_URL = os.environ.get("REDIS_URL", "")
+if REDIS_URL:
+    import redis.asyncio as aioredis
+
+ROOM_CHANNEL_PREFIX = "genesis:room:"
+
+
 class ConnectionManager:
     """Manage WebSocket connections"""
 
+    # Messages buffered per connection before the oldest are dropped
+    SEND_QUEUE_SIZE = 128
+
     def __init__(self):
-        self.rooms: Dict[str, Set[WebSocket]] = {}
+        # room_id -> {websocket: user info}; user_info indexes the same
+        # dicts by socket, so disconnect() can find a socket's room
+        self.rooms: Dict[str, Dict[WebSocket, Dict]] = {}
         self.user_info: Dict[WebSocket, Dict] = {}
+        # Kept apart from user_info, which is sent to clients as-is
+        self.send_queues: Dict[WebSocket, asyncio.Queue] = {}
+        self.writers: Dict[WebSocket, asyncio.Task] = {}
+        self.redis = None
+        # Identifies this worker's own broadcasts when they come back from Redis
+        self.worker_id = uuid.uuid4().hex
+        self._relay_task: Optional[asyncio.Task] = None
+
+    async def start(self):
+        """Connect to Redis and start relaying other workers' broadcasts"""
+        if REDIS_URL:
+            self.redis = aioredis.from_url(REDIS_URL, decode_responses=True)
+            self._relay_task = asyncio.create_task(self._relay())
+
+    async def stop(self):
+        if self._relay_task:
+            self._relay_task.cancel()
+            await asyncio.gather(self._relay_task, return_exceptions=True)
+        if self.redis:
+            await self.redis.aclose()
+
+    async def _relay(self):
+        """Deliver broadcasts published by other workers to local sockets
+
+        One pattern subscription covers every room, so joining or leaving a
+        room never has to (un)subscribe; messages for rooms with no local
+        sockets are simply dropped.
+        """
+        while True:
+            pubsub = self.redis.pubsub()
+            try:
+                await pubsub.psubscribe(ROOM_CHANNEL_PREFIX + "*")
+                async for message in pubsub.listen():
+                    if message["type"] != "pmessage":
+                        continue
+                    worker, droppable, payload = message["data"].split("|", 2)
+                    if worker != self.worker_id:
+                        room_id = message["channel"][len(ROOM_CHANNEL_PREFIX):]
+                        self._deliver(room_id, payload, None, droppable == "1")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Redis relay error: {e}")
+                await asyncio.sleep(1)
+            finally:
+                await pubsub.aclose()
 
     async def connect(self, websocket: WebSocket, room_id: str, user_info: Dict):
         await websocket.accept()
 
-        if room_id not in self.rooms:
-            self.rooms[room_id] = set()
+        info = {**user_info, "room_id": room_id}
+        self.rooms.setdefault(room_id, {})[websocket] = info
+        self.user_info[websocket] = info
 
-        self.rooms[room_id].add(websocket)
-        self.user_info[websocket] = {**user_info, "room_id": room_id}
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.SEND_QUEUE_SIZE)
+        self.send_queues[websocket] = queue
+        self.writers[websocket] = asyncio.create_task(self._drain(websocket, queue, room_id))
 
         await self.broadcast(room_id, {
             "type": "user_join",
             "user": user_info,
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": ws_timestamp()
         }, exclude=websocket)
 
-    def disconnect(self, websocket: WebSocket):
-        if websocket in self.user_info:
-            room_id = self.user_info[websocket]["room_id"]
-            user_info = self.user_info[websocket]
-
-            if room_id in self.rooms:
-                self.rooms[room_id].discard(websocket)
-                if not self.rooms[room_id]:
-                    del self.rooms[room_id]
+    def _leave_room(self, websocket: WebSocket, room_id: str):
+        room = self.rooms.get(room_id)
+        if room is not None:
+            room.pop(websocket, None)
+            if not room:
+                del self.rooms[room_id]
 
-            del self.user_info[websocket]
+    def disconnect(self, websocket: WebSocket):
+        user_info = self.user_info.pop(websocket, None)
+        if user_info is not None:
+            room_id = user_info["room_id"]
+            self._leave_room(websocket, room_id)
+            self.send_queues.pop(websocket, None)
+            writer = self.writers.pop(websocket, None)
+            if writer:
+                writer.cancel()
             return room_id, user_info
         return None, None
 
-    async def broadcast(self, room_id: str, message: Dict, exclude: WebSocket = None):
-        if room_id not in self.rooms:
+    async def _drain(self, websocket: WebSocket, queue: asyncio.Queue, room_id: str):
+        """Write queued messages to one socket, so a slow peer only delays itself"""
+        try:
+            while True:
+                await websocket.send_text(await queue.get())
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            # Dead socket: stop broadcasting to it; disconnect() still cleans
+            # up its user_info when its receive loop ends
+            self._leave_room(websocket, room_id)
+
+    def _enqueue(self, websocket: WebSocket, payload: str):
+        queue = self.send_queues.get(websocket)
+        if queue is None:
+            return
+        try:
+            queue.put_nowait(payload)
+        except asyncio.QueueFull:
+            queue.get_nowait()
+            queue.put_nowait(payload)
+
+    def send(self, websocket: WebSocket, message: Dict):
+        """Queue a message for one connection"""
+        self._enqueue(websocket, orjson.dumps(message).decode())
+
+    async def broadcast(self, room_id: str, message: Dict, exclude: WebSocket = None, droppable: bool = False):
+        """Queue a message for everyone in a room, on every worker
+
+        droppable messages (cursor positions) skip peers that are already
+        half a queue behind, rather than pushing out messages that matter.
+        """
+        # Encode once; each connection's writer task does the sending
+        payload = orjson.dumps(message).decode()
+        self._deliver(room_id, payload, exclude, droppable)
+
+        if self.redis:
+            try:
+                await self.redis.publish(
+                    ROOM_CHANNEL_PREFIX + room_id,
+                    f"{self.worker_id}|{int(droppable)}|{payload}"
+                )
+            except Exception as e:
+                print(f"Redis publish error: {e}")
+
+    def _deliver(self, room_id: str, payload: str, exclude: Optional[WebSocket], droppable: bool):
+        """Queue an encoded message for this worker's sockets in a room"""
+        room = self.rooms.get(room_id)
+        if not room:
             return
 
-        for connection in self.rooms[room_id]:
-            if connection != exclude:
-                try:
-                    await connection.send_json(message)
-                except Exception:
-                    pass
+        for connection in room:
+            if connection is not exclude:
+                if droppable:
+                    queue = self.send_queues.get(connection)
+                    if queue is not None and queue.qsize() >= self.SEND_QUEUE_SIZE // 2:
+                        continue
+                self._enqueue(connection, payload)
 
     def get_room_users(self, room_id: str) -> List[Dict]:
-        if room_id not in self.rooms:
-            return []
-        return [self.user_info[ws] for ws in self.rooms[room_id] if ws in self.user_info]
+        """Users connected to this room on this worker only"""
+        room = self.rooms.get(room_id)
+        return list(room.values()) if room else []
 
 
 manager = ConnectionManager()
 
 
+# Cursor positions are broadcast at most 30 times a second per user
+CURSOR_MOVE_INTERVAL = 1 / 30
+
+
 @app.websocket("/ws/{room_id}")
 async def websocket_endpoint(websocket: WebSocket, room_id: str):
     """WebSocket endpoint for real-time collaboration"""
@@ -1784,12 +2296,35 @@ async def websocket_endpoint(websocket: WebSocket, room_id: str):
 
     await manager.connect(websocket, room_id, user_info)
 
-    await websocket.send_json({
+    manager.send(websocket, {
         "type": "room_state",
         "users": manager.get_room_users(room_id),
-        "timestamp": datetime.utcnow().isoformat()
+        "timestamp": ws_timestamp()
     })
 
+    # cursor_move is throttled to one broadcast per CURSOR_MOVE_INTERVAL;
+    # moves in between are coalesced and the latest position is sent last
+    loop = asyncio.get_running_loop()
+    cursor_sent_at = 0.0
+    cursor_pending: Dict = {}
+    cursor_flush: Optional[asyncio.Task] = None
+
+    async def broadcast_cursor(position: Dict):
+        nonlocal cursor_sent_at
+        cursor_sent_at = loop.time()
+        await manager.broadcast(room_id, {
+            "type": "cursor_move",
+            "user_id": user_id,
+            "position": position,
+            "timestamp": ws_timestamp()
+        }, exclude=websocket, droppable=True)
+
+    async def flush_cursor(delay: float):
+        nonlocal cursor_flush
+        await asyncio.sleep(delay)
+        cursor_flush = None
+        await broadcast_cursor(cursor_pending)
+
     try:
         while True:
             data = await websocket.receive_json()
@@ -1800,32 +2335,40 @@ async def websocket_endpoint(websocket: WebSocket, room_id: str):
                     "type": "chat",
                     "user": user_info,
                     "content": data.get("content", ""),
-                    "timestamp": datetime.utcnow().isoformat()
+                    "timestamp": ws_timestamp()
                 })
             elif msg_type == "code_change":
                 await manager.broadcast(room_id, {
                     "type": "code_change",
                     "user": user_info,
                     "changes": data.get("changes", []),
-                    "timestamp": datetime.utcnow().isoformat()
+                    "timestamp": ws_timestamp()
                 }, exclude=websocket)
             elif msg_type == "cursor_move":
-                await manager.broadcast(room_id, {
-                    "type": "cursor_move",
-                    "user_id": user_id,
-                    "position": data.get("position", {}),
-                    "timestamp": datetime.utcnow().isoformat()
-                }, exclude=websocket)
+                position = data.get("position", {})
+                wait = CURSOR_MOVE_INTERVAL - (loop.time() - cursor_sent_at)
+                if cursor_flush is None and wait <= 0:
+                    await broadcast_cursor(position)
+                else:
+                    cursor_pending = position
+                    if cursor_flush is None:
+                        cursor_flush = asyncio.create_task(flush_cursor(wait))
             elif msg_type == "ping":
-                await websocket.send_json({"type": "pong"})
+                manager.send(websocket, {"type": "pong"})
 
     except WebSocketDisconnect:
+        pass
+    finally:
+        # Also runs on send errors and bad frames, so the writer task,
+        # pending cursor flush and room membership never outlive the socket
+        if cursor_flush:
+            cursor_flush.cancel()
         room_id, user_info = manager.disconnect(websocket)
         if room_id:
             await manager.broadcast(room_id, {
                 "type": "user_leave",
                 "user": user_info,
-                "timestamp": datetime.utcnow().isoformat()
+                "timestamp": ws_timestamp()
             })
 
 
@@ -1833,15 +2376,6 @@ async def websocket_endpoint(websocket: WebSocket, room_id: str):
 # Terminal WebSocket - Shell Access
 # ============================================================================
 
-import pty
-import os
-import select
-import subprocess
-import signal
-import struct
-import fcntl
-import termios
-
 class TerminalSession:
     """Manages a PTY terminal session"""
 
@@ -1893,19 +2427,36 @@ class TerminalSession:
         if self.master_fd and self.running:
             os.write(self.master_fd, data)
 
-    def read(self, timeout: float = 0.1) -> bytes:
-        """Read data from terminal"""
+    async def read(self) -> bytes:
+        """Wait for terminal output and read it
+
+        The PTY is registered with the event loop only while a read is
+        pending, so output is picked up as soon as it's written without
+        polling, and a slow client leaves unread output in the PTY buffer.
+        Returns b"" once the shell has exited.
+        """
         if not self.master_fd or not self.running:
             return b""
 
-        ready, _, _ = select.select([self.master_fd], [], [], timeout)
-        if ready:
-            try:
-                return os.read(self.master_fd, 4096)
-            except OSError:
-                self.running = False
-                return b""
-        return b""
+        fd = self.master_fd
+        loop = asyncio.get_running_loop()
+        ready = loop.create_future()
+        loop.add_reader(fd, lambda: ready.done() or ready.set_result(None))
+        try:
+            await ready
+        finally:
+            loop.remove_reader(fd)
+
+        try:
+            data = os.read(fd, 65536)
+        except OSError:
+            # Linux reports EOF on a PTY master as EIO
+            self.running = False
+            return b""
+        if not data:
+            # macOS/BSD return b"" at EOF instead
+            self.running = False
+        return data
 
     def stop(self):
         """Stop terminal session"""
@@ -1928,15 +2479,31 @@ class TerminalSession:
 # Store active terminal sessions
 terminal_sessions: Dict[str, TerminalSession] = {}
 
+# Output that follows within this window is sent in the same frame, so
+# bursts (cat, ls -R) go out as a few large messages instead of many small ones
+TERMINAL_COALESCE_SECONDS = 0.008
+TERMINAL_FRAME_MAX = 256 * 1024
+
+# Binary-mode frames start with an opcode byte; 0x01 = raw PTY output
+TERMINAL_OUTPUT_OPCODE = b"\x01"
+
 
 @app.websocket("/ws/terminal/{session_id}")
 async def terminal_websocket(websocket: WebSocket, session_id: str):
-    """WebSocket endpoint for terminal access"""
+    """WebSocket endpoint for terminal access
+
+    The first message is {"rows", "cols"}, plus "binary": true for clients
+    that take output as binary frames (TERMINAL_OUTPUT_OPCODE + raw PTY
+    bytes) instead of JSON {"type": "output", "data": <text>} messages.
+    Control messages (pong, error) are JSON text either way.
+    """
     await websocket.accept()
 
     # Create new terminal session
     terminal = TerminalSession()
     terminal_sessions[session_id] = terminal
+    output_task = None
+    receive_task = None
 
     try:
         # Get initial size from client
@@ -1944,61 +2511,93 @@ async def terminal_websocket(websocket: WebSocket, session_id: str):
         rows = init_data.get("rows", 24)
         cols = init_data.get("cols", 80)
 
+        binary = bool(init_data.get("binary"))
+
         # Start terminal
         terminal.start(rows, cols)
 
+        # Incremental, so characters split across reads aren't mangled
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+
+        async def send_output(chunk: bytes):
+            if binary:
+                await websocket.send_bytes(TERMINAL_OUTPUT_OPCODE + chunk)
+            else:
+                data = decoder.decode(chunk)
+                if data:
+                    await send_ws(websocket, {"type": "output", "data": data})
+
         # Send welcome message
-        await websocket.send_json({
-            "type": "output",
-            "data": f"\r\n\x1b[1;36m╭───────────────────────────────────────╮\x1b[0m\r\n"
-                    f"\x1b[1;36m│\x1b[0m  \x1b[1;32mGenesis Engine Terminal\x1b[0m              \x1b[1;36m│\x1b[0m\r\n"
-                    f"\x1b[1;36m│\x1b[0m  Session: {session_id[:8]}                    \x1b[1;36m│\x1b[0m\r\n"
-                    f"\x1b[1;36m╰───────────────────────────────────────╯\x1b[0m\r\n\r\n"
-        })
+        await send_output((
+            f"\r\n\x1b[1;36m╭───────────────────────────────────────╮\x1b[0m\r\n"
+            f"\x1b[1;36m│\x1b[0m  \x1b[1;32mGenesis Engine Terminal\x1b[0m              \x1b[1;36m│\x1b[0m\r\n"
+            f"\x1b[1;36m│\x1b[0m  Session: {session_id[:8]}                    \x1b[1;36m│\x1b[0m\r\n"
+            f"\x1b[1;36m╰───────────────────────────────────────╯\x1b[0m\r\n\r\n"
+        ).encode())
 
         async def read_output():
             """Read terminal output and send to client"""
+            loop = asyncio.get_running_loop()
             while terminal.running:
-                output = terminal.read(0.05)
-                if output:
-                    await websocket.send_json({
-                        "type": "output",
-                        "data": output.decode("utf-8", errors="replace")
-                    })
-                await asyncio.sleep(0.01)
+                output = await terminal.read()
+                if not output:
+                    continue
+
+                buf = bytearray(output)
+                deadline = loop.time() + TERMINAL_COALESCE_SECONDS
+                while len(buf) < TERMINAL_FRAME_MAX:
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        break
+                    try:
+                        more = await asyncio.wait_for(terminal.read(), remaining)
+                    except asyncio.TimeoutError:
+                        break
+                    if not more:
+                        break
+                    buf += more
+
+                await send_output(bytes(buf))
 
         # Start output reader task
         output_task = asyncio.create_task(read_output())
 
-        # Handle incoming messages
+        # Handle incoming messages until the client leaves or the shell
+        # exits (which ends the output task)
         while True:
-            try:
-                message = await asyncio.wait_for(websocket.receive_json(), timeout=0.1)
-                msg_type = message.get("type")
-
-                if msg_type == "input":
-                    data = message.get("data", "")
-                    terminal.write(data.encode("utf-8"))
-                elif msg_type == "resize":
-                    rows = message.get("rows", 24)
-                    cols = message.get("cols", 80)
-                    terminal.resize(rows, cols)
-                elif msg_type == "ping":
-                    await websocket.send_json({"type": "pong"})
-            except asyncio.TimeoutError:
-                if not terminal.running:
-                    break
-                continue
+            receive_task = asyncio.create_task(websocket.receive_json())
+            await asyncio.wait({receive_task, output_task}, return_when=asyncio.FIRST_COMPLETED)
+            if not receive_task.done():
+                break
+            message = receive_task.result()
+            receive_task = None
+            msg_type = message.get("type")
+
+            if msg_type == "input":
+                data = message.get("data", "")
+                terminal.write(data.encode("utf-8"))
+            elif msg_type == "resize":
+                rows = message.get("rows", 24)
+                cols = message.get("cols", 80)
+                terminal.resize(rows, cols)
+            elif msg_type == "ping":
+                await send_ws(websocket, {"type": "pong"})
 
     except WebSocketDisconnect:
         pass
     except Exception as e:
         try:
-            await websocket.send_json({"type": "error", "message": str(e)})
+            await send_ws(websocket, {"type": "error", "message": str(e)})
         except:
             pass
     finally:
         # Cleanup
+        if receive_task:
+            receive_task.cancel()
+        if output_task:
+            # Let the reader unregister the PTY before its fd is closed
+            output_task.cancel()
+            await asyncio.gather(output_task, return_exceptions=True)
         terminal.stop()
         if session_id in terminal_sessions:
             del terminal_sessions[session_id]
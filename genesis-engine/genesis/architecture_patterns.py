@@ -4,8 +4,13 @@ Architecture Patterns for Factory Code Generation.
 Defines structural patterns including Volatility-Based Decomposition (VBD).
 """
 
-from pydantic import BaseModel, Field
-from typing import List, Dict, Optional
+import asyncio
+from functools import lru_cache
+from operator import itemgetter
+from pathlib import Path
+from string import Formatter
+from pydantic import BaseModel, ConfigDict, Field
+from typing import Any, Callable, Dict, Final, Iterable, Iterator, List, Optional, TextIO, Tuple, Union
 from enum import Enum
 
 
@@ -232,24 +237,24 @@ class VBDArchitectureSpec(BaseModel):
 # Code Generation Templates
 # ============================================================================
 
-class VBDCodeTemplates:
-    """Code templates for VBD components."""
-
-    @staticmethod
-    def engine_template() -> str:
-        """Template for an Engine (core business logic)."""
-        return '''"""
-{domain} Engine - Core Business Logic.
+def _module_header(title: str, summary: str) -> str:
+    """Module docstring shared by every generated VBD file."""
+    return '"""\n' + title + "\n\n" + summary + '\n"""\n\n'
 
-Contains pure business rules and calculations.
-No external dependencies, framework-agnostic.
-"""
 
+_ENGINE_TEMPLATE: Final[str] = _module_header(
+    "{domain} Engine - Core Business Logic.",
+    (
+        "Contains pure business rules and calculations.\n"
+        "No external dependencies, framework-agnostic."
+    ),
+) + '''from dataclasses import dataclass
 from typing import List, Optional
 from decimal import Decimal
 from ..dtos.{domain_lower}_dto import {domain}DTO, {domain}ResultDTO
 
 
+@dataclass(slots=True, frozen=True)
 class {domain}Engine:
     """
     Core business logic for {domain_description}.
@@ -259,10 +264,6 @@ class {domain}Engine:
     Testing: Pure unit tests (no mocks)
     """
 
-    def __init__(self):
-        """Initialize engine with business rules."""
-        pass
-
     def calculate_{operation}(
         self,
         input_data: {domain}DTO
@@ -319,23 +320,25 @@ class {domain}Engine:
         return result
 '''
 
-    @staticmethod
-    def manager_template() -> str:
-        """Template for a Manager (orchestration)."""
-        return '''"""
-{domain} Manager - Workflow Orchestration.
-
-Coordinates operations across engines and adapters.
-Handles transactions and state management.
-"""
-
-from typing import Optional
+_MANAGER_TEMPLATE: Final[str] = _module_header(
+    "{domain} Manager - Workflow Orchestration.",
+    (
+        "Coordinates operations across engines and adapters.\n"
+        "Handles transactions and state management."
+    ),
+) + '''import asyncio
+import logging
+from dataclasses import dataclass, field
+from typing import Coroutine, Optional, Set
 from ..dtos.{domain_lower}_dto import Create{domain}DTO, {domain}ResponseDTO
 from ..interfaces.i_repository import IRepository
 from ..interfaces.i_event_publisher import IEventPublisher
 from ..engines.{domain_lower}_engine import {domain}Engine
 
+logger = logging.getLogger(__name__)
 
+
+@dataclass(slots=True, frozen=True)
 class {domain}Manager:
     """
     Orchestrates {domain} workflows.
@@ -343,25 +346,20 @@ class {domain}Manager:
     Volatility: MEDIUM (changes with workflow evolution)
     Dependencies: Engines, Adapters (via interfaces), DTOs
     Testing: Integration tests (mock adapters)
-    """
 
-    def __init__(
-        self,
-        engine: {domain}Engine,
-        repository: IRepository,
-        event_publisher: Optional[IEventPublisher] = None
-    ):
-        """
-        Initialize manager with dependencies.
+    Attributes:
+        engine: Business logic engine
+        repository: Data persistence adapter
+        event_publisher: Event publishing adapter (optional)
+    """
 
-        Args:
-            engine: Business logic engine
-            repository: Data persistence adapter
-            event_publisher: Event publishing adapter (optional)
-        """
-        self.engine = engine
-        self.repository = repository
-        self.event_publisher = event_publisher
+    engine: {domain}Engine
+    repository: IRepository
+    event_publisher: Optional[IEventPublisher] = None
+    # Strong references to in-flight event publishes so they aren't GC'd
+    _bg_tasks: Set[asyncio.Task] = field(
+        default_factory=set, init=False, repr=False, compare=False
+    )
 
     async def create_{domain_lower}(
         self,
@@ -403,9 +401,9 @@ class {domain}Manager:
         except Exception as e:
             raise RuntimeError(f"Failed to persist {domain_lower}: {{e}}")
 
-        # Step 5: Publish event (fire-and-forget)
+        # Step 5: Publish event (fire-and-forget, runs in the background)
         if self.event_publisher:
-            await self._publish_created_event(entity)
+            self._in_background(self._publish_created_event(entity))
 
         # Step 6: Return response
         return self._map_entity_to_response(entity)
@@ -452,9 +450,9 @@ class {domain}Manager:
         # Step 4: Persist
         updated_entity = await self.repository.update(id, updated_data)
 
-        # Step 5: Publish event
+        # Step 5: Publish event (in the background)
         if self.event_publisher:
-            await self._publish_updated_event(updated_entity)
+            self._in_background(self._publish_updated_event(updated_entity))
 
         return self._map_entity_to_response(updated_entity)
 
@@ -475,6 +473,21 @@ class {domain}Manager:
             created_at=entity["created_at"],
         )
 
+    def _in_background(self, coro: Coroutine) -> None:
+        """Run a coroutine without delaying the response."""
+        task = asyncio.create_task(coro)
+        self._bg_tasks.add(task)
+        task.add_done_callback(self._background_done)
+
+    def _background_done(self, task: asyncio.Task) -> None:
+        """Forget a finished background task, logging any failure."""
+        self._bg_tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(
+                "Background task failed in {domain}Manager",
+                exc_info=task.exception(),
+            )
+
     async def _publish_created_event(self, entity):
         """Publish entity created event."""
         await self.event_publisher.publish(
@@ -490,21 +503,110 @@ class {domain}Manager:
         )
 '''
 
-    @staticmethod
-    def adapter_template() -> str:
-        """Template for an Adapter (external integration)."""
-        return '''"""
-{system} Adapter - External System Integration.
-
-Implements interface contract for {system} integration.
-High volatility - changes with external API updates.
-"""
-
-from typing import List, Optional, Dict, Any
+_ADAPTER_TEMPLATE: Final[str] = _module_header(
+    "{system} Adapter - External System Integration.",
+    (
+        "Implements interface contract for {system} integration.\n"
+        "High volatility - changes with external API updates.\n"
+        "\n"
+        "Requires: pip install httpx msgspec"
+    ),
+) + '''import asyncio
+from typing import Awaitable, Callable, List, Optional, Dict, Any, Set, Tuple
+import httpx
+import msgspec
 from ..interfaces.i_{interface_lower} import I{interface}
 from ..dtos.{domain_lower}_dto import {domain}DTO
 
 
+# Shared HTTP clients keyed by (base_url, api_key, timeout), so adapters
+# created per request reuse one connection pool instead of opening their own
+_client_cache: Dict[Tuple[str, str, int], httpx.AsyncClient] = {{}}
+
+
+class _{system}Record(msgspec.Struct):
+    """{system} API resource as it appears on the wire."""
+
+    id: Optional[str] = None
+    {system_lower}_field1: Optional[str] = None
+    {system_lower}_field2: Optional[int] = None
+    created_at: Optional[str] = None
+
+
+# Typed decoders parse {system} responses straight into records; request
+# bodies are encoded natively too (the client already sends the JSON
+# Content-Type header)
+_DECODER = msgspec.json.Decoder(_{system}Record)
+_LIST_DECODER = msgspec.json.Decoder(List[_{system}Record])
+_ENCODER = msgspec.json.Encoder()
+
+
+class AsyncBatcher:
+    """
+    Coalesce single submissions into batched flushes.
+
+    A batch is flushed once max_items are pending or max_wait_s has passed
+    since the first pending item, whichever comes first. Each submitter
+    gets back the result at its own position in the flushed batch.
+    """
+
+    def __init__(
+        self,
+        flush: Callable[[List[Any]], Awaitable[List[Any]]],
+        max_items: int = 100,
+        max_wait_s: float = 0.01
+    ):
+        self._flush = flush
+        self.max_items = max_items
+        self.max_wait_s = max_wait_s
+        self._pending: List[Tuple[Any, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def submit(self, item: Any) -> Any:
+        """Queue one item and wait for its result from the batched flush."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((item, future))
+        if len(self._pending) >= self.max_items:
+            self._dispatch()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait_s, self._dispatch)
+        return await future
+
+    def _dispatch(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.create_task(self._run(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: List[Tuple[Any, asyncio.Future]]) -> None:
+        futures = [future for _, future in batch]
+        try:
+            results = await self._flush([item for item, _ in batch])
+            if len(results) != len(batch):
+                raise RuntimeError(
+                    f"Batch flush returned {{len(results)}} results for {{len(batch)}} items"
+                )
+        except Exception as e:
+            for future in futures:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        except BaseException:
+            # Cancelled mid-flush; don't leave submitters waiting forever
+            for future in futures:
+                future.cancel()
+            raise
+        for future, result in zip(futures, results, strict=True):
+            if not future.done():
+                future.set_result(result)
+
+
 class {system}Adapter(I{interface}):
     """
     Adapter for {system} integration.
@@ -518,7 +620,9 @@ class {system}Adapter(I{interface}):
         self,
         api_key: str,
         base_url: str = "https://api.{system_lower}.com",
-        timeout: int = 30
+        timeout: int = 30,
+        batch_size: int = 0,
+        batch_wait_s: float = 0.01
     ):
         """
         Initialize {system} adapter.
@@ -527,24 +631,35 @@ class {system}Adapter(I{interface}):
             api_key: {system} API key
             base_url: {system} API base URL
             timeout: Request timeout in seconds
+            batch_size: Coalesce create() calls into bulk requests of up
+                to this many items (0 sends each create on its own)
+            batch_wait_s: Max time a create() waits for its batch to fill
         """
         self.api_key = api_key
         self.base_url = base_url
         self.timeout = timeout
-        self._client = self._initialize_client()
-
-    def _initialize_client(self):
-        """Initialize HTTP client for {system}."""
-        import httpx
-        return httpx.AsyncClient(
-            base_url=self.base_url,
-            headers={{
-                "Authorization": f"Bearer {{self.api_key}}",
-                "Content-Type": "application/json",
-            }},
-            timeout=self.timeout,
+        self._base_path = "/{resource}"
+        self._client = self._get_client()
+        self._batcher = (
+            AsyncBatcher(self.create_many, max_items=batch_size, max_wait_s=batch_wait_s)
+            if batch_size > 0 else None
         )
 
+    def _get_client(self) -> httpx.AsyncClient:
+        """Return the shared HTTP client for {system} with these settings."""
+        key = (self.base_url, self.api_key, self.timeout)
+        client = _client_cache.get(key)
+        if client is None or client.is_closed:
+            client = _client_cache[key] = httpx.AsyncClient(
+                base_url=self.base_url,
+                headers={{
+                    "Authorization": f"Bearer {{self.api_key}}",
+                    "Content-Type": "application/json",
+                }},
+                timeout=self.timeout,
+            )
+        return client
+
     async def create(self, data: {domain}DTO) -> Dict[str, Any]:
         """
         Create resource in {system}.
@@ -560,22 +675,53 @@ class {system}Adapter(I{interface}):
         Raises:
             RuntimeError: If {system} API call fails
         """
+        if self._batcher is not None:
+            return await self._batcher.submit(data)
+
         try:
             # Map DTO to {system} format
             payload = self._map_dto_to_{system_lower}(data)
 
             # Call {system} API
             response = await self._client.post(
-                "/{resource}",
-                json=payload
+                self._base_path,
+                content=_ENCODER.encode(payload)
             )
             response.raise_for_status()
 
             # Parse response
-            result = response.json()
+            record = _DECODER.decode(response.content)
 
             # Map {system} response to standard format
-            return self._map_{system_lower}_to_entity(result)
+            return self._map_{system_lower}_to_entity(record)
+
+        except Exception as e:
+            raise RuntimeError(f"{system} API error: {{e}}")
+
+    async def create_many(self, items: List[{domain}DTO]) -> List[Dict[str, Any]]:
+        """
+        Create many resources in one {system} bulk request.
+
+        Args:
+            items: Input DTOs
+
+        Returns:
+            Created resources, in input order
+
+        Raises:
+            RuntimeError: If {system} API call fails
+        """
+        try:
+            payload = [self._map_dto_to_{system_lower}(item) for item in items]
+
+            response = await self._client.post(
+                "/bulk/{resource}",
+                content=_ENCODER.encode(payload)
+            )
+            response.raise_for_status()
+
+            records = _LIST_DECODER.decode(response.content)
+            return [self._map_{system_lower}_to_entity(record) for record in records]
 
         except Exception as e:
             raise RuntimeError(f"{system} API error: {{e}}")
@@ -591,15 +737,15 @@ class {system}Adapter(I{interface}):
             Resource data or None if not found
         """
         try:
-            response = await self._client.get(f"/{resource}/{{id}}")
+            response = await self._client.get(self._base_path + "/" + id)
 
             if response.status_code == 404:
                 return None
 
             response.raise_for_status()
-            result = response.json()
+            record = _DECODER.decode(response.content)
 
-            return self._map_{system_lower}_to_entity(result)
+            return self._map_{system_lower}_to_entity(record)
 
         except Exception as e:
             raise RuntimeError(f"{system} API error: {{e}}")
@@ -623,13 +769,13 @@ class {system}Adapter(I{interface}):
             payload = self._map_update_to_{system_lower}(data)
 
             response = await self._client.patch(
-                f"/{resource}/{{id}}",
-                json=payload
+                self._base_path + "/" + id,
+                content=_ENCODER.encode(payload)
             )
             response.raise_for_status()
 
-            result = response.json()
-            return self._map_{system_lower}_to_entity(result)
+            record = _DECODER.decode(response.content)
+            return self._map_{system_lower}_to_entity(record)
 
         except Exception as e:
             raise RuntimeError(f"{system} API error: {{e}}")
@@ -645,7 +791,7 @@ class {system}Adapter(I{interface}):
             True if deleted successfully
         """
         try:
-            response = await self._client.delete(f"/{resource}/{{id}}")
+            response = await self._client.delete(self._base_path + "/" + id)
             response.raise_for_status()
             return True
 
@@ -659,13 +805,13 @@ class {system}Adapter(I{interface}):
             "{system_lower}_field2": dto.field2,
         }}
 
-    def _map_{system_lower}_to_entity(self, data: Dict[str, Any]) -> Dict[str, Any]:
-        """Map {system} response to standard entity format."""
+    def _map_{system_lower}_to_entity(self, record: _{system}Record) -> Dict[str, Any]:
+        """Map a decoded {system} record to standard entity format."""
         return {{
-            "id": data.get("id"),
-            "field1": data.get("{system_lower}_field1"),
-            "field2": data.get("{system_lower}_field2"),
-            "created_at": data.get("created_at"),
+            "id": record.id,
+            "field1": record.{system_lower}_field1,
+            "field2": record.{system_lower}_field2,
+            "created_at": record.created_at,
         }}
 
     def _map_update_to_{system_lower}(self, data: Dict[str, Any]) -> Dict[str, Any]:
@@ -675,20 +821,25 @@ class {system}Adapter(I{interface}):
         }}
 
     async def close(self):
-        """Close adapter connections."""
-        await self._client.aclose()
-'''
+        """
+        Release this adapter.
 
-    @staticmethod
-    def dto_template() -> str:
-        """Template for DTOs (data structures)."""
-        return '''"""
-{domain} DTOs - Data Transfer Objects.
+        The HTTP client is shared with every adapter using the same
+        settings, so it stays open; call aclose_clients() at app shutdown.
+        """
 
-Input/output data structures with validation.
-"""
 
-from pydantic import BaseModel, Field, validator
+async def aclose_clients() -> None:
+    """Close every shared {system} HTTP client (call once at app shutdown)."""
+    clients = list(_client_cache.values())
+    _client_cache.clear()
+    await asyncio.gather(*(client.aclose() for client in clients))
+'''
+
+_DTO_TEMPLATE: Final[str] = _module_header(
+    "{domain} DTOs - Data Transfer Objects.",
+    "Input/output data structures with validation.",
+) + '''from pydantic import BaseModel, ConfigDict, Field, field_validator
 from typing import Optional
 from decimal import Decimal
 from datetime import datetime
@@ -701,6 +852,17 @@ class Create{domain}DTO(BaseModel):
     Volatility: MEDIUM (changes with requirements)
     """
 
+    model_config = ConfigDict(
+        json_schema_extra={{
+            "example": {{
+                "field1": "Example value",
+                "field2": 42,
+                "amount": "99.99",
+                "optional_field": "Optional"
+            }}
+        }}
+    )
+
     field1: str = Field(
         ...,
         min_length=1,
@@ -727,23 +889,14 @@ class Create{domain}DTO(BaseModel):
         description="Optional field"
     )
 
-    @validator("field1")
-    def validate_field1(cls, v):
+    @field_validator("field1")
+    @classmethod
+    def validate_field1(cls, v: str) -> str:
         """Custom validation for field1."""
         if not v.strip():
             raise ValueError("field1 cannot be empty")
         return v.strip()
 
-    class Config:
-        json_schema_extra = {{
-            "example": {{
-                "field1": "Example value",
-                "field2": 42,
-                "amount": "99.99",
-                "optional_field": "Optional"
-            }}
-        }}
-
 
 class Update{domain}DTO(BaseModel):
     """Input DTO for {domain} updates."""
@@ -756,15 +909,8 @@ class Update{domain}DTO(BaseModel):
 class {domain}ResponseDTO(BaseModel):
     """Output DTO for {domain} queries."""
 
-    id: str = Field(..., description="Unique identifier")
-    field1: str
-    field2: int
-    amount: Decimal
-    created_at: datetime
-    updated_at: Optional[datetime] = None
-
-    class Config:
-        json_schema_extra = {{
+    model_config = ConfigDict(
+        json_schema_extra={{
             "example": {{
                 "id": "123e4567-e89b-12d3-a456-426614174000",
                 "field1": "Example",
@@ -773,6 +919,14 @@ class {domain}ResponseDTO(BaseModel):
                 "created_at": "2024-01-01T12:00:00Z"
             }}
         }}
+    )
+
+    id: str = Field(..., description="Unique identifier")
+    field1: str
+    field2: int
+    amount: Decimal
+    created_at: datetime
+    updated_at: Optional[datetime] = None
 
 
 class {domain}ResultDTO(BaseModel):
@@ -784,16 +938,10 @@ class {domain}ResultDTO(BaseModel):
     metadata: Optional[dict] = None
 '''
 
-    @staticmethod
-    def interface_template() -> str:
-        """Template for Interfaces (contracts)."""
-        return '''"""
-{interface} Interface - Contract Definition.
-
-Abstract base class defining contract for {interface_description}.
-"""
-
-from abc import ABC, abstractmethod
+_INTERFACE_TEMPLATE: Final[str] = _module_header(
+    "{interface} Interface - Contract Definition.",
+    "Abstract base class defining contract for {interface_description}.",
+) + '''from abc import ABC, abstractmethod
 from typing import List, Optional, Dict, Any
 
 
@@ -892,6 +1040,196 @@ class I{interface}(ABC):
         pass
 '''
 
+_TEMPLATES: Dict[str, str] = {
+    "engine": _ENGINE_TEMPLATE,
+    "manager": _MANAGER_TEMPLATE,
+    "adapter": _ADAPTER_TEMPLATE,
+    "dto": _DTO_TEMPLATE,
+    "interface": _INTERFACE_TEMPLATE,
+}
+
+_ALL_TEMPLATES: Tuple[str, ...] = tuple(_TEMPLATES.values())
+
+# Third-party packages each generated file imports
+_TEMPLATE_REQUIREMENTS: Dict[str, Tuple[str, ...]] = {
+    "engine": (),
+    "manager": (),
+    "adapter": ("httpx", "msgspec"),
+    "dto": ("pydantic>=2",),
+    "interface": (),
+}
+
+
+class _SafeCtx(dict):
+    """Render context that leaves unknown placeholders in place."""
+
+    def __missing__(self, key: str) -> str:
+        return "{" + key + "}"
+
+
+# A render plan: the literal segments between placeholders plus a getter
+# that pulls every placeholder value out of a context in one C call.
+_RenderPlan = Tuple[Tuple[str, ...], Callable[[Dict[str, Any]], Tuple[Any, ...]]]
+
+
+def _compile(template: str) -> _RenderPlan:
+    """Split a template into literal segments and an ordered key getter."""
+    segments: List[str] = []
+    keys: List[str] = []
+    pending = ""
+    for literal, field, spec, conversion in Formatter().parse(template):
+        if spec or conversion:
+            raise ValueError(f"Unsupported format spec in VBD template field: {field}")
+        pending += literal
+        if field is not None:
+            segments.append(pending)
+            keys.append(field)
+            pending = ""
+    segments.append(pending)
+
+    if len(keys) > 1:
+        return tuple(segments), itemgetter(*keys)
+
+    # itemgetter returns a bare value for one key; the plan needs a tuple
+    def getter(context: Dict[str, Any]) -> Tuple[Any, ...]:
+        return tuple(context[key] for key in keys)
+
+    return tuple(segments), getter
+
+
+def _render_plan(plan: _RenderPlan, context: Dict[str, Any]) -> str:
+    """Interleave a plan's segments with values looked up from context."""
+    segments, getter = plan
+    out: List[Any] = [None] * (2 * len(segments) - 1)
+    out[0::2] = segments
+    out[1::2] = map(str, getter(context))
+    return "".join(out)
+
+
+def _iter_plan(plan: _RenderPlan, context: Dict[str, Any]) -> Iterator[str]:
+    """Yield a plan's output piece by piece instead of joining it."""
+    segments, getter = plan
+    yield segments[0]
+    for segment, value in zip(segments[1:], getter(context), strict=True):
+        yield str(value)
+        yield segment
+
+
+# Cap on scaffold files written concurrently (bounds open file descriptors)
+SCAFFOLD_WRITE_CONCURRENCY = 32
+
+
+@lru_cache(maxsize=None)
+def _plan(name: str) -> _RenderPlan:
+    """Compile a template's render plan on first use and keep it."""
+    try:
+        template = _TEMPLATES[name]
+    except KeyError:
+        raise KeyError(f"Unknown VBD template: {name}") from None
+    return _compile(template)
+
+
+class VBDCodeTemplates:
+    """Code templates for VBD components.
+
+    Templates use ``str.format`` syntax: ``{domain}``-style placeholders,
+    with literal braces in the generated code doubled. Use ``render`` to
+    produce source code rather than substituting placeholders by hand.
+    """
+
+    TEMPLATE_NAMES = tuple(_TEMPLATES)
+
+    @staticmethod
+    def requirements(names: Iterable[str]) -> List[str]:
+        """Sorted pip requirements for the code generated from these templates."""
+        return sorted({req for name in names for req in _TEMPLATE_REQUIREMENTS.get(name, ())})
+
+    @classmethod
+    def render(cls, name: str, **context: str) -> str:
+        """
+        Render the named template (e.g. ``"engine"``) with placeholder values.
+
+        Placeholders missing from ``context`` are left as ``{name}`` so a
+        partial context renders in one pass instead of raising KeyError.
+        """
+        return _render_plan(_plan(name), _SafeCtx(context))
+
+    @classmethod
+    def render_bytes(cls, name: str, **context: str) -> bytes:
+        """Render the named template as UTF-8 bytes, ready for a binary write."""
+        return cls.render(name, **context).encode("utf-8")
+
+    @classmethod
+    def render_many(cls, name: str, contexts: Iterable[Dict[str, str]]) -> List[str]:
+        """Render one template for many contexts (e.g. one per domain)."""
+        plan = _plan(name)
+        return [_render_plan(plan, _SafeCtx(context)) for context in contexts]
+
+    @classmethod
+    def iter_render(cls, name: str, **context: str) -> Iterator[str]:
+        """Yield the rendered template in pieces, without building the full string."""
+        return _iter_plan(_plan(name), _SafeCtx(context))
+
+    @classmethod
+    def render_to(cls, name: str, stream: TextIO, **context: str) -> None:
+        """Stream the rendered template into an open text file."""
+        stream.writelines(cls.iter_render(name, **context))
+
+    @classmethod
+    def write_file(cls, name: str, path: Union[str, Path], **context: str) -> None:
+        """Render a template straight into a file, creating parent directories."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # newline="" keeps the template's line endings on every platform
+        with path.open("w", encoding="utf-8", newline="") as fh:
+            cls.render_to(name, fh, **context)
+
+    @classmethod
+    async def write_files(
+        cls,
+        jobs: Iterable[Tuple[str, Union[str, Path], Dict[str, str]]],
+        max_concurrency: int = SCAFFOLD_WRITE_CONCURRENCY,
+    ) -> None:
+        """
+        Render and write many scaffold files concurrently.
+
+        Args:
+            jobs: (template name, output path, context) triples
+            max_concurrency: Max files being written at once
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def write_one(name: str, path: Union[str, Path], context: Dict[str, str]) -> None:
+            async with semaphore:
+                await asyncio.to_thread(cls.write_file, name, path, **context)
+
+        await asyncio.gather(*(write_one(*job) for job in jobs))
+
+    @staticmethod
+    def engine_template() -> str:
+        """Template for an Engine (core business logic)."""
+        return _ENGINE_TEMPLATE
+
+    @staticmethod
+    def manager_template() -> str:
+        """Template for a Manager (orchestration)."""
+        return _MANAGER_TEMPLATE
+
+    @staticmethod
+    def adapter_template() -> str:
+        """Template for an Adapter (external integration)."""
+        return _ADAPTER_TEMPLATE
+
+    @staticmethod
+    def dto_template() -> str:
+        """Template for DTOs (data structures)."""
+        return _DTO_TEMPLATE
+
+    @staticmethod
+    def interface_template() -> str:
+        """Template for Interfaces (contracts)."""
+        return _INTERFACE_TEMPLATE
+
 
 # ============================================================================
 # Other Architecture Patterns (Brief)
@@ -899,27 +1237,27 @@ class I{interface}(ABC):
 
 class LayeredArchitectureSpec(BaseModel):
     """Traditional N-tier layered architecture."""
+    model_config = ConfigDict(extra="forbid", frozen=True)
+
     pattern: ArchitecturePattern = ArchitecturePattern.LAYERED
-    layers: List[str] = Field(
-        default_factory=lambda: [
-            "Presentation (API/Controllers)",
-            "Business Logic (Services)",
-            "Data Access (Repositories)",
-            "Domain Models"
-        ]
+    layers: Tuple[str, ...] = (
+        "Presentation (API/Controllers)",
+        "Business Logic (Services)",
+        "Data Access (Repositories)",
+        "Domain Models",
     )
 
 
 class CleanArchitectureSpec(BaseModel):
     """Clean Architecture (Uncle Bob)."""
+    model_config = ConfigDict(extra="forbid", frozen=True)
+
     pattern: ArchitecturePattern = ArchitecturePattern.CLEAN
-    layers: List[str] = Field(
-        default_factory=lambda: [
-            "Entities (Domain Models)",
-            "Use Cases (Application Logic)",
-            "Interface Adapters (Controllers, Gateways)",
-            "Frameworks & Drivers (External)"
-        ]
+    layers: Tuple[str, ...] = (
+        "Entities (Domain Models)",
+        "Use Cases (Application Logic)",
+        "Interface Adapters (Controllers, Gateways)",
+        "Frameworks & Drivers (External)",
     )
 
 
@@ -22,34 +22,196 @@ References:
 - RFC 6585 (Rate Limiting): https://datatracker.ietf.org/doc/html/rfc6585
 """
 
-from typing import Dict, List, Any
-from pydantic import BaseModel, Field
+import copy
+import hashlib
+import re
+from dataclasses import asdict, dataclass
+from functools import lru_cache
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Dict, List, Any, Mapping
+from urllib.parse import urlsplit
+import orjson
 
+if TYPE_CHECKING:
+    from pydantic import BaseModel
 
-class APIDesignFinding(BaseModel):
-    """Structured API design finding output"""
 
-    finding_id: str = Field(..., description="Unique identifier (API-001, API-002, etc.)")
-    title: str = Field(..., description="Brief title of the issue")
-    severity: str = Field(..., description="CRITICAL/HIGH/MEDIUM/LOW")
-    api_type: str = Field(..., description="REST/GraphQL/gRPC")
+@lru_cache(maxsize=None)
+def _finding_model() -> type:
+    """Build APIDesignFinding on first use so importing the knowledge base skips pydantic"""
+    from pydantic import BaseModel, Field
 
-    location: Dict[str, Any] = Field(default_factory=dict, description="Endpoint, schema, service")
-    description: str = Field(..., description="Detailed description of the issue")
-    standard_violated: str = Field(default="", description="Which standard/best practice violated")
+    class APIDesignFinding(BaseModel):
+        """Structured API design finding output"""
 
-    current_design: str = Field(default="", description="Current API design")
-    recommended_design: str = Field(..., description="Recommended API design")
-    rationale: str = Field(..., description="Why this design is better")
+        finding_id: str = Field(..., description="Unique identifier (API-001, API-002, etc.)")
+        title: str = Field(..., description="Brief title of the issue")
+        severity: str = Field(..., description="CRITICAL/HIGH/MEDIUM/LOW")
+        api_type: str = Field(..., description="REST/GraphQL/gRPC")
 
-    maturity_level: str = Field(default="", description="Richardson maturity level (for REST)")
-    versioning_impact: str = Field(default="", description="Version compatibility impact")
+        location: Dict[str, Any] = Field(default_factory=dict, description="Endpoint, schema, service")
+        description: str = Field(..., description="Detailed description of the issue")
+        standard_violated: str = Field(default="", description="Which standard/best practice violated")
 
-    testing_guidance: str = Field(default="", description="How to test the API")
-    tools: List[Dict[str, str]] = Field(default_factory=list, description="Tools for validation")
-    references: List[str] = Field(default_factory=list, description="Standards references")
+        current_design: str = Field(default="", description="Current API design")
+        recommended_design: str = Field(..., description="Recommended API design")
+        rationale: str = Field(..., description="Why this design is better")
 
-    migration_strategy: Dict[str, Any] = Field(default_factory=dict, description="How to migrate")
+        maturity_level: str = Field(default="", description="Richardson maturity level (for REST)")
+        versioning_impact: str = Field(default="", description="Version compatibility impact")
+
+        testing_guidance: str = Field(default="", description="How to test the API")
+        tools: List[Dict[str, str]] = Field(default_factory=list, description="Tools for validation")
+        references: List[str] = Field(default_factory=list, description="Standards references")
+
+        migration_strategy: Dict[str, Any] = Field(default_factory=dict, description="How to migrate")
+
+        @classmethod
+        def model_json_schema(cls, *args, **kwargs) -> Dict[str, Any]:
+            """JSON schema, generated once per class for the default arguments"""
+            if args or kwargs:
+                return super().model_json_schema(*args, **kwargs)
+            return copy.deepcopy(_default_json_schema(cls))
+
+    # Resolvable as a module attribute, so instances still pickle
+    APIDesignFinding.__qualname__ = "APIDesignFinding"
+    return APIDesignFinding
+
+
+@lru_cache(maxsize=None)
+def _default_json_schema(model: type) -> Dict[str, Any]:
+    return super(_finding_model(), model).model_json_schema()
+
+
+def __getattr__(name: str) -> Any:
+    if name == "APIDesignFinding":
+        cls = globals()[name] = _finding_model()
+        return cls
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+class _FrozenDict(dict):
+    """Read-only dict shared by the memoized knowledge sections"""
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("API design knowledge sections are read-only; copy before modifying")
+
+    __setitem__ = __delitem__ = __ior__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+
+    def __reduce_ex__(self, protocol):
+        # copy/deepcopy/pickle produce a plain, mutable dict
+        return dict, (dict(self),)
+
+
+class _FrozenList(list):
+    """Read-only list shared by the memoized knowledge sections"""
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("API design knowledge sections are read-only; copy before modifying")
+
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _readonly
+    append = extend = insert = pop = remove = clear = sort = reverse = _readonly
+
+    def __reduce_ex__(self, protocol):
+        return list, (list(self),)
+
+
+def _freeze(value: Any) -> Any:
+    """Recursively wrap a knowledge section in read-only containers"""
+    if isinstance(value, dict):
+        return _FrozenDict((k, _freeze(v)) for k, v in value.items())
+    if isinstance(value, list):
+        return _FrozenList(_freeze(v) for v in value)
+    return value
+
+
+@dataclass(frozen=True, slots=True)
+class HTTPMethodSpec:
+    """Semantics of a single HTTP method (Richardson level 2)"""
+
+    purpose: str
+    safe: bool
+    idempotent: bool
+    cacheable: bool
+    request_body: bool
+    response_body: bool
+
+
+_GET_SPEC = HTTPMethodSpec("Retrieve resource(s)", True, True, True, False, True)
+_POST_SPEC = HTTPMethodSpec("Create resource", False, False, False, True, True)
+_PUT_SPEC = HTTPMethodSpec("Replace resource", False, True, False, True, True)
+_PATCH_SPEC = HTTPMethodSpec("Partial update", False, False, False, True, True)
+_DELETE_SPEC = HTTPMethodSpec("Delete resource", False, True, False, False, False)
+
+_HTTP_METHODS: Mapping[str, HTTPMethodSpec] = MappingProxyType({
+    "GET": _GET_SPEC,
+    "POST": _POST_SPEC,
+    "PUT": _PUT_SPEC,
+    "PATCH": _PATCH_SPEC,
+    "DELETE": _DELETE_SPEC,
+})
+
+
+def http_methods() -> Mapping[str, HTTPMethodSpec]:
+    """Read-only HTTP method specs keyed by method name"""
+    return _HTTP_METHODS
+
+
+# Validation tools and references attached to findings, per API type
+_TOOLS_BY_API_TYPE: Dict[str, List[Dict[str, str]]] = {
+    "REST": [
+        {
+            "name": "OpenAPI Validator",
+            "command": "npm install -g @stoplight/spectral-cli && spectral lint openapi.yaml",
+            "description": "Validate OpenAPI specs",
+        },
+        {
+            "name": "Postman",
+            "description": "API testing and documentation",
+        },
+    ],
+    "GraphQL": [
+        {
+            "name": "GraphQL Inspector",
+            "command": "npm install -g @graphql-inspector/cli",
+            "description": "Validate GraphQL schemas",
+        },
+    ],
+    "gRPC": [
+        {
+            "name": "buf",
+            "command": "brew install bufbuild/buf/buf",
+            "description": "Protobuf linter and validator",
+        },
+    ],
+}
+
+_REFERENCES_BY_API_TYPE: Dict[str, List[str]] = {
+    "REST": [
+        "OpenAPI 3.1: https://spec.openapis.org/oas/v3.1.0",
+        "RFC 7807 Problem Details: https://datatracker.ietf.org/doc/html/rfc7807",
+        "Richardson Maturity Model: https://martinfowler.com/articles/richardsonMaturityModel.html",
+    ],
+    "GraphQL": [
+        "GraphQL Best Practices: https://graphql.org/learn/best-practices/",
+        "Relay Cursor Connections: https://relay.dev/graphql/connections.htm",
+    ],
+    "gRPC": [
+        "gRPC Style Guide: https://grpc.io/docs/guides/",
+        "Protocol Buffers: https://protobuf.dev/",
+    ],
+}
+
+_MIGRATION_STRATEGY: Dict[str, Any] = {
+    "approach": "Gradual migration with versioning",
+    "steps": (
+        "1. Create new version with improved design",
+        "2. Run both versions in parallel",
+        "3. Migrate clients gradually",
+        "4. Deprecate old version after migration period",
+    ),
+}
 
 
 class EnhancedAPIDesignAssistant:
@@ -71,11 +233,15 @@ class EnhancedAPIDesignAssistant:
         self.version = "2.0.0"
         self.standards = ["OpenAPI 3.1", "GraphQL", "gRPC", "RFC 7807", "RFC 6585"]
 
+    # Memoized sections below are shared and read-only (see _freeze); copy
+    # one before modifying it.
+
     # =========================================================================
     # REST API DESIGN - Richardson Maturity Model
     # =========================================================================
 
     @staticmethod
+    @lru_cache(maxsize=None)
     def richardson_maturity_model() -> Dict[str, Any]:
         """
         Richardson Maturity Model for RESTful APIs
@@ -85,7 +251,7 @@ class EnhancedAPIDesignAssistant:
         Level 2: Multiple URIs, HTTP verbs
         Level 3: Hypermedia controls (HATEOAS)
         """
-        return {
+        return _freeze({
             "level_0_swamp_of_pox": {
                 "description": "Single URI, single HTTP method (usually POST), RPC-style",
                 "characteristics": [
@@ -196,46 +362,7 @@ DELETE /users/123
 # Using HTTP verbs as intended
                 """,
                 "http_methods": {
-                    "GET": {
-                        "purpose": "Retrieve resource(s)",
-                        "safe": True,
-                        "idempotent": True,
-                        "cacheable": True,
-                        "request_body": False,
-                        "response_body": True,
-                    },
-                    "POST": {
-                        "purpose": "Create resource",
-                        "safe": False,
-                        "idempotent": False,
-                        "cacheable": False,
-                        "request_body": True,
-                        "response_body": True,
-                    },
-                    "PUT": {
-                        "purpose": "Replace resource",
-                        "safe": False,
-                        "idempotent": True,
-                        "cacheable": False,
-                        "request_body": True,
-                        "response_body": True,
-                    },
-                    "PATCH": {
-                        "purpose": "Partial update",
-                        "safe": False,
-                        "idempotent": False,
-                        "cacheable": False,
-                        "request_body": True,
-                        "response_body": True,
-                    },
-                    "DELETE": {
-                        "purpose": "Delete resource",
-                        "safe": False,
-                        "idempotent": True,
-                        "cacheable": False,
-                        "request_body": False,
-                        "response_body": False,
-                    },
+                    name: asdict(spec) for name, spec in _HTTP_METHODS.items()
                 },
                 "status_codes": {
                     "2xx_success": {
@@ -339,18 +466,19 @@ Content-Type: application/hal+json
 }
                 """,
             },
-        }
+        })
 
     # =========================================================================
     # REST API - URL DESIGN AND RESOURCE NAMING
     # =========================================================================
 
     @staticmethod
+    @lru_cache(maxsize=None)
     def url_design_best_practices() -> Dict[str, Any]:
         """
         URL design and resource naming conventions
         """
-        return {
+        return _freeze({
             "resource_naming": {
                 "principles": [
                     "Use nouns, not verbs",
@@ -512,18 +640,19 @@ Accept: application/vnd.myapi.user.v2+json
                     "Provide version-agnostic documentation",
                 ],
             },
-        }
+        })
 
     # =========================================================================
     # REST API - PAGINATION PATTERNS
     # =========================================================================
 
     @staticmethod
+    @lru_cache(maxsize=None)
     def pagination_patterns() -> Dict[str, Any]:
         """
         Pagination patterns for large datasets
         """
-        return {
+        return _freeze({
             "offset_pagination": {
                 "description": "Page number and size (simplest, most common)",
                 "pros": ["Simple to implement", "Easy to understand", "Can jump to any page"],
@@ -715,18 +844,19 @@ X-Total-Pages: 50
 # Parse Link header to get pagination URLs
                 """,
             },
-        }
+        })
 
     # =========================================================================
     # REST API - ERROR HANDLING (RFC 7807)
     # =========================================================================
 
     @staticmethod
+    @lru_cache(maxsize=None)
     def error_handling() -> Dict[str, Any]:
         """
         Error response standards (RFC 7807 Problem Details)
         """
-        return {
+        return _freeze({
             "rfc_7807_problem_details": {
                 "description": "Standardized error response format",
                 "media_type": "application/problem+json",
@@ -879,18 +1009,19 @@ Retry-After: 3600
 # - Stable across API versions
                 """,
             },
-        }
+        })
 
     # =========================================================================
     # REST API - RATE LIMITING
     # =========================================================================
 
     @staticmethod
+    @lru_cache(maxsize=None)
     def rate_limiting() -> Dict[str, Any]:
         """
         Rate limiting and throttling (RFC 6585)
         """
-        return {
+        return _freeze({
             "rate_limit_headers": {
                 "description": "Standard headers for rate limiting",
                 "headers": {
@@ -1059,7 +1190,7 @@ X-RateLimit-Limit: 10000
 X-RateLimit-Remaining: 9999
                 """,
             },
-        }
+        })
 
     # =========================================================================
     # GRAPHQL SCHEMA DESIGN
@@ -1589,11 +1720,11 @@ service UserService {
         current_design: str,
         recommended_design: str,
         standard_violated: str,
-    ) -> APIDesignFinding:
+    ) -> "BaseModel":
         """
         Generate a structured API design finding
         """
-        return APIDesignFinding(
+        return _finding_model()(
             finding_id=finding_id,
             title=title,
             severity=severity,
@@ -1607,66 +1738,77 @@ service UserService {
             testing_guidance="Test with automated tools and manual review",
             tools=self._get_tools(api_type),
             references=self._get_references(api_type),
+            # Fresh containers per finding; Dict[str, Any] values are not copied
             migration_strategy={
-                "approach": "Gradual migration with versioning",
-                "steps": [
-                    "1. Create new version with improved design",
-                    "2. Run both versions in parallel",
-                    "3. Migrate clients gradually",
-                    "4. Deprecate old version after migration period",
-                ],
+                "approach": _MIGRATION_STRATEGY["approach"],
+                "steps": list(_MIGRATION_STRATEGY["steps"]),
             },
         )
 
     @staticmethod
     def _get_tools(api_type: str) -> List[Dict[str, str]]:
-        tools = {
-            "REST": [
-                {
-                    "name": "OpenAPI Validator",
-                    "command": "npm install -g @stoplight/spectral-cli && spectral lint openapi.yaml",
-                    "description": "Validate OpenAPI specs",
-                },
-                {
-                    "name": "Postman",
-                    "description": "API testing and documentation",
-                },
-            ],
-            "GraphQL": [
-                {
-                    "name": "GraphQL Inspector",
-                    "command": "npm install -g @graphql-inspector/cli",
-                    "description": "Validate GraphQL schemas",
-                },
-            ],
-            "gRPC": [
-                {
-                    "name": "buf",
-                    "command": "brew install bufbuild/buf/buf",
-                    "description": "Protobuf linter and validator",
-                },
-            ],
-        }
-        return tools.get(api_type, [])
+        return _TOOLS_BY_API_TYPE.get(api_type, [])
 
     @staticmethod
     def _get_references(api_type: str) -> List[str]:
-        refs = {
-            "REST": [
-                "OpenAPI 3.1: https://spec.openapis.org/oas/v3.1.0",
-                "RFC 7807 Problem Details: https://datatracker.ietf.org/doc/html/rfc7807",
-                "Richardson Maturity Model: https://martinfowler.com/articles/richardsonMaturityModel.html",
-            ],
-            "GraphQL": [
-                "GraphQL Best Practices: https://graphql.org/learn/best-practices/",
-                "Relay Cursor Connections: https://relay.dev/graphql/connections.htm",
-            ],
-            "gRPC": [
-                "gRPC Style Guide: https://grpc.io/docs/guides/",
-                "Protocol Buffers: https://protobuf.dev/",
-            ],
-        }
-        return refs.get(api_type, [])
+        return _REFERENCES_BY_API_TYPE.get(api_type, [])
+
+
+# URL anti-patterns from url_design_best_practices()["resource_naming"],
+# compiled once and checked against the path only (query strings may
+# legitimately use underscores, e.g. ?price_min=100)
+_URL_ANTIPATTERNS = (
+    ("verb_in_path", re.compile(
+        r"/(?:get|create|update|delete|remove|fetch|add|send|calculate)(?:[A-Z_/]|$)"
+    )),
+    ("underscore_in_path", re.compile(r"_")),
+    ("mixed_case_path", re.compile(r"[A-Z]")),
+    ("file_extension", re.compile(r"\.(?:json|xml|html?|php|aspx?)$")),
+)
+_URL_SCHEME = re.compile(r"[A-Za-z][A-Za-z0-9+.-]*://")
+
+
+def find_url_antipatterns(url: str) -> List[str]:
+    """
+    Names of the resource-naming rules a URL breaks
+
+    e.g. "GET /getUser/123.json" -> ["verb_in_path", "mixed_case_path", "file_extension"]
+    """
+    for token in reversed(url.split()):
+        if token.startswith("/") or _URL_SCHEME.match(token):
+            path = urlsplit(token).path
+            return [name for name, pattern in _URL_ANTIPATTERNS if pattern.search(path)]
+    # No path or absolute URL given (e.g. just "GET")
+    return []
+
+
+# Static knowledge sections that are also served as pre-encoded JSON
+JSON_SECTIONS = (
+    "richardson_maturity_model",
+    "url_design_best_practices",
+    "pagination_patterns",
+    "error_handling",
+    "rate_limiting",
+)
+
+
+@lru_cache(maxsize=None)
+def section_json(section: str) -> bytes:
+    """
+    Knowledge section (e.g. "rate_limiting") encoded as JSON bytes
+
+    Encoded once per section, so response handlers can write the cached
+    bytes straight into the body instead of re-serializing the dict.
+    """
+    if section not in JSON_SECTIONS:
+        raise KeyError(f"Unknown API design section: {section}")
+    return orjson.dumps(getattr(EnhancedAPIDesignAssistant, section)())
+
+
+@lru_cache(maxsize=None)
+def section_etag(section: str) -> str:
+    """Quoted HTTP ETag for section_json(section), for If-None-Match checks"""
+    return '"' + hashlib.blake2b(section_json(section), digest_size=16).hexdigest() + '"'
 
 
 def create_enhanced_api_design_assistant():
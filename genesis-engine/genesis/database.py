@@ -5,12 +5,17 @@ Supports both SQLite (local) and PostgreSQL (production)
 
 import os
 import json
-from datetime import datetime
+import threading
+import time
+from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Iterator
 from contextlib import contextmanager
+from dataclasses import dataclass, field
 from urllib.parse import urlparse
 
+import orjson
+
 # Determine database type from DATABASE_URL
 DATABASE_URL = os.environ.get("DATABASE_URL", "")
 
@@ -28,15 +33,54 @@ else:
     DB_PATH = Path(__file__).parent.parent / "genesis.db"
 
 
+# One SQLite connection per thread, reused across calls. close_connections
+# bumps the generation so every thread reopens instead of reusing a closed one
+_local = threading.local()
+_sqlite_conns: List[Any] = []
+_sqlite_conns_lock = threading.Lock()
+_sqlite_generation = 0
+
+
+def _open_sqlite():
+    """Open a new SQLite connection with the engine's pragmas"""
+    conn = sqlite3.connect(str(DB_PATH), check_same_thread=False)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute("PRAGMA mmap_size=268435456")
+    return conn
+
+
+def _sqlite_connection():
+    """Return this thread's SQLite connection, opening it on first use"""
+    conn = getattr(_local, "conn", None)
+    if conn is None or _local.generation != _sqlite_generation:
+        conn = _open_sqlite()
+        with _sqlite_conns_lock:
+            _sqlite_conns.append(conn)
+            _local.generation = _sqlite_generation
+        _local.conn = conn
+    return conn
+
+
 def get_connection():
     """Get database connection"""
     if USE_POSTGRES:
         conn = psycopg2.connect(DATABASE_URL)
         return conn
     else:
-        conn = sqlite3.connect(str(DB_PATH))
-        conn.row_factory = sqlite3.Row
-        return conn
+        return _sqlite_connection()
+
+
+def close_connections():
+    """Close the pooled SQLite connections (call on shutdown)"""
+    global _sqlite_generation
+    with _sqlite_conns_lock:
+        _sqlite_generation += 1
+        while _sqlite_conns:
+            _sqlite_conns.pop().close()
+    _local.__dict__.clear()
 
 
 @contextmanager
@@ -52,7 +96,8 @@ def get_db():
         conn.rollback()
         raise
     finally:
-        conn.close()
+        if USE_POSTGRES:
+            conn.close()
 
 
 def _param(idx: int = None) -> str:
@@ -172,6 +217,15 @@ def init_db():
                 )
             """)
 
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS ai_cache (
+                    key TEXT PRIMARY KEY,
+                    model TEXT NOT NULL,
+                    response_text TEXT NOT NULL,
+                    created_at INTEGER NOT NULL
+                )
+            """)
+
         else:
             # SQLite schema
             cursor.execute("""
@@ -267,6 +321,15 @@ def init_db():
                 )
             """)
 
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS ai_cache (
+                    key TEXT PRIMARY KEY,
+                    model TEXT NOT NULL,
+                    response_text TEXT NOT NULL,
+                    created_at INTEGER NOT NULL
+                )
+            """)
+
         # Initialize default settings
         default_settings = [
             ("anthropic_api_key", "", "ai", "Anthropic API Key", "Required for AI-powered planning and code review", "secret", True),
@@ -316,7 +379,8 @@ def create_factory(
     domain: str,
     description: str = "",
     assistants: List[str] = None,
-    config: Dict[str, Any] = None
+    config: Dict[str, Any] = None,
+    status: str = "active"
 ) -> Dict[str, Any]:
     """Create a new factory"""
     created_at = datetime.utcnow().isoformat()
@@ -327,21 +391,21 @@ def create_factory(
         cursor = conn.cursor()
         if USE_POSTGRES:
             cursor.execute("""
-                INSERT INTO factories (id, name, domain, description, assistants, config, created_at, updated_at)
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-            """, (id, name, domain, description, json.dumps(assistants_list), json.dumps(config_dict), created_at, created_at))
+                INSERT INTO factories (id, name, domain, description, status, assistants, config, created_at, updated_at)
+                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+            """, (id, name, domain, description, status, json.dumps(assistants_list), json.dumps(config_dict), created_at, created_at))
         else:
             cursor.execute("""
-                INSERT INTO factories (id, name, domain, description, assistants, config, created_at, updated_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """, (id, name, domain, description, json.dumps(assistants_list), json.dumps(config_dict), created_at, created_at))
+                INSERT INTO factories (id, name, domain, description, status, assistants, config, created_at, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, (id, name, domain, description, status, json.dumps(assistants_list), json.dumps(config_dict), created_at, created_at))
 
     return {
         "id": id,
         "name": name,
         "domain": domain,
         "description": description,
-        "status": "active",
+        "status": status,
         "assistants": assistants_list,
         "config": config_dict,
         "features_built": 0,
@@ -432,6 +496,25 @@ def increment_features(factory_id: str) -> None:
             )
 
 
+def mark_provisioned_older_than(seconds: float) -> int:
+    """Mark every factory provisioning for at least `seconds` as active"""
+    now = datetime.utcnow()
+    cutoff = (now - timedelta(seconds=seconds)).isoformat()
+    with get_db() as conn:
+        cursor = conn.cursor()
+        if USE_POSTGRES:
+            cursor.execute(
+                "UPDATE factories SET status = 'active', updated_at = %s WHERE status = 'provisioning' AND created_at <= %s",
+                (now.isoformat(), cutoff)
+            )
+        else:
+            cursor.execute(
+                "UPDATE factories SET status = 'active', updated_at = ? WHERE status = 'provisioning' AND created_at <= ?",
+                (now.isoformat(), cutoff)
+            )
+        return cursor.rowcount
+
+
 def _row_to_factory(row, cursor=None) -> Dict[str, Any]:
     """Convert row to factory dict"""
     if USE_POSTGRES:
@@ -474,22 +557,29 @@ def create_review(
     findings: List[Dict[str, Any]],
     assistants_used: List[str],
     factory_id: str = None,
-    language: str = None
+    language: str = None,
+    increment_features: bool = False
 ) -> Dict[str, Any]:
-    """Create a new code review"""
+    """Create a new code review
+
+    With increment_features, the factory's features_built count is bumped
+    in the same transaction as the insert.
+    """
+    lang = language or _detect_language(file_name)
+    params = (id, factory_id, file_name, lang, code_snippet,
+              orjson.dumps(findings).decode(), orjson.dumps(assistants_used).decode())
     with get_db() as conn:
         cursor = conn.cursor()
-        lang = language or _detect_language(file_name)
-        if USE_POSTGRES:
-            cursor.execute("""
-                INSERT INTO reviews (id, factory_id, file_name, language, code_snippet, findings, assistants_used)
-                VALUES (%s, %s, %s, %s, %s, %s, %s)
-            """, (id, factory_id, file_name, lang, code_snippet, json.dumps(findings), json.dumps(assistants_used)))
-        else:
-            cursor.execute("""
-                INSERT INTO reviews (id, factory_id, file_name, language, code_snippet, findings, assistants_used)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-            """, (id, factory_id, file_name, lang, code_snippet, json.dumps(findings), json.dumps(assistants_used)))
+        p = "%s" if USE_POSTGRES else "?"
+        cursor.execute(f"""
+            INSERT INTO reviews (id, factory_id, file_name, language, code_snippet, findings, assistants_used)
+            VALUES ({_params(7)})
+        """, params)
+        if increment_features and factory_id:
+            cursor.execute(
+                f"UPDATE factories SET features_built = features_built + 1, updated_at = {p} WHERE id = {p}",
+                (datetime.utcnow().isoformat(), factory_id)
+            )
 
     return get_review(id)
 
@@ -576,37 +666,55 @@ def _detect_language(file_name: str) -> str:
 # =============================================================================
 
 def get_stats() -> Dict[str, Any]:
-    """Get overall stats"""
+    """Get overall stats
+
+    One round trip: the counts are scalar subqueries, and finding severities
+    are tallied in SQL from the reviews' JSON (a finding without a severity
+    counts as low).
+    """
     with get_db() as conn:
         cursor = conn.cursor()
-
-        cursor.execute("SELECT COUNT(*) FROM factories")
-        total_factories = cursor.fetchone()[0]
-
-        cursor.execute("SELECT COUNT(*) FROM factories WHERE status = 'active'")
-        active_factories = cursor.fetchone()[0]
-
-        cursor.execute("SELECT COALESCE(SUM(features_built), 0) FROM factories")
-        total_features = cursor.fetchone()[0]
-
-        cursor.execute("SELECT COUNT(*) FROM reviews")
-        total_reviews = cursor.fetchone()[0]
-
-        cursor.execute("SELECT findings FROM reviews")
-        findings_count = {"critical": 0, "high": 0, "medium": 0, "low": 0}
-        for row in cursor.fetchall():
-            findings = json.loads(row[0]) if row[0] else []
-            for finding in findings:
-                severity = finding.get("severity", "low")
-                if severity in findings_count:
-                    findings_count[severity] += 1
+        if USE_POSTGRES:
+            cursor.execute("""
+                SELECT
+                    (SELECT COUNT(*) FROM factories),
+                    (SELECT COUNT(*) FROM factories WHERE status = 'active'),
+                    (SELECT COALESCE(SUM(features_built), 0) FROM factories),
+                    (SELECT COUNT(*) FROM reviews),
+                    COUNT(*) FILTER (WHERE sev = 'critical'),
+                    COUNT(*) FILTER (WHERE sev = 'high'),
+                    COUNT(*) FILTER (WHERE sev = 'medium'),
+                    COUNT(*) FILTER (WHERE sev = 'low')
+                FROM (
+                    SELECT CASE WHEN f ? 'severity' THEN f->>'severity' ELSE 'low' END AS sev
+                    FROM reviews r, jsonb_array_elements(NULLIF(r.findings, '')::jsonb) AS f
+                ) s
+            """)
+        else:
+            cursor.execute("""
+                SELECT
+                    (SELECT COUNT(*) FROM factories),
+                    (SELECT COUNT(*) FROM factories WHERE status = 'active'),
+                    (SELECT COALESCE(SUM(features_built), 0) FROM factories),
+                    (SELECT COUNT(*) FROM reviews),
+                    COALESCE(SUM(sev = 'critical'), 0),
+                    COALESCE(SUM(sev = 'high'), 0),
+                    COALESCE(SUM(sev = 'medium'), 0),
+                    COALESCE(SUM(sev = 'low'), 0)
+                FROM (
+                    SELECT CASE WHEN json_type(f.value, '$.severity') IS NULL THEN 'low'
+                                ELSE json_extract(f.value, '$.severity') END AS sev
+                    FROM reviews r, json_each(COALESCE(NULLIF(r.findings, ''), '[]')) AS f
+                )
+            """)
+        row = cursor.fetchone()
 
         return {
-            "total_factories": total_factories,
-            "active_factories": active_factories,
-            "total_features": total_features,
-            "total_reviews": total_reviews,
-            "findings": findings_count
+            "total_factories": row[0],
+            "active_factories": row[1],
+            "total_features": row[2],
+            "total_reviews": row[3],
+            "findings": {"critical": row[4], "high": row[5], "medium": row[6], "low": row[7]}
         }
 
 
@@ -649,6 +757,66 @@ def create_setup_task(
     }
 
 
+@dataclass(frozen=True, slots=True)
+class SetupTaskDraft:
+    """A setup task to be inserted by create_setup_tasks_bulk
+
+    The stored task id is "<factory_id>-<key>", so drafts that do not
+    depend on the factory can be shared across calls.
+    """
+    key: str
+    category: str
+    title: str
+    description: str = ""
+    task_type: str = "manual"
+    action_url: Optional[str] = None
+    action_command: Optional[str] = None
+    required: bool = True
+    metadata: Dict[str, Any] = field(default_factory=dict)
+
+
+def create_setup_tasks_bulk(factory_id: str, tasks: List[SetupTaskDraft]) -> Optional[List[Dict[str, Any]]]:
+    """Replace all setup tasks for a factory in a single transaction
+
+    Tasks are stored in list order. Returns None without writing anything
+    if the factory does not exist.
+    """
+    created_at = datetime.utcnow().isoformat()
+    rows = []
+    for order_index, task in enumerate(tasks):
+        rows.append({
+            "id": f"{factory_id}-{task.key}", "factory_id": factory_id, "category": task.category,
+            "title": task.title, "description": task.description,
+            "status": "pending", "task_type": task.task_type,
+            "action_url": task.action_url, "action_command": task.action_command,
+            "required": task.required, "order_index": order_index,
+            "metadata": task.metadata, "completed_at": None,
+            "completed_by": None, "notes": None, "created_at": created_at
+        })
+
+    params = [
+        (r["id"], factory_id, r["category"], r["title"], r["description"], r["task_type"],
+         r["action_url"], r["action_command"], r["required"], r["order_index"],
+         json.dumps(r["metadata"]), created_at)
+        for r in rows
+    ]
+
+    with get_db() as conn:
+        cursor = conn.cursor()
+        p = "%s" if USE_POSTGRES else "?"
+        cursor.execute(f"SELECT 1 FROM factories WHERE id = {p}", (factory_id,))
+        if cursor.fetchone() is None:
+            return None
+        cursor.execute(f"DELETE FROM setup_tasks WHERE factory_id = {p}", (factory_id,))
+        cursor.executemany(f"""
+            INSERT INTO setup_tasks (id, factory_id, category, title, description, task_type,
+                                     action_url, action_command, required, order_index, metadata, created_at)
+            VALUES ({_params(12)})
+        """, params)
+
+    return rows
+
+
 def get_setup_task(id: str) -> Optional[Dict[str, Any]]:
     """Get setup task by ID"""
     with get_db() as conn:
@@ -672,6 +840,39 @@ def get_setup_tasks_for_factory(factory_id: str) -> List[Dict[str, Any]]:
         return [_row_to_setup_task(row, cursor) for row in cursor.fetchall()]
 
 
+def iter_setup_tasks_for_factory(factory_id: str, batch_size: int = 200) -> Iterator[Dict[str, Any]]:
+    """Yield setup tasks for a factory without materializing the full list
+
+    The generator reads through its own connection, closed once it is
+    exhausted or closed, so other queries never share its cursor state.
+    It may be advanced from different threads, but not concurrently.
+    """
+    if USE_POSTGRES:
+        with get_db() as conn:
+            cursor = conn.cursor(name="setup_tasks_stream")
+            cursor.execute("SELECT * FROM setup_tasks WHERE factory_id = %s ORDER BY order_index, created_at", (factory_id,))
+            yield from _iter_rows(cursor, batch_size, _row_to_setup_task)
+        return
+
+    conn = _open_sqlite()
+    try:
+        cursor = conn.cursor()
+        cursor.execute("SELECT * FROM setup_tasks WHERE factory_id = ? ORDER BY order_index, created_at", (factory_id,))
+        yield from _iter_rows(cursor, batch_size, _row_to_setup_task)
+    finally:
+        conn.close()
+
+
+def _iter_rows(cursor, batch_size: int, convert) -> Iterator[Dict[str, Any]]:
+    """Yield converted rows from an executed cursor, batch_size at a time"""
+    while True:
+        rows = cursor.fetchmany(batch_size)
+        if not rows:
+            return
+        for row in rows:
+            yield convert(row, cursor)
+
+
 def update_setup_task(id: str, **kwargs) -> Optional[Dict[str, Any]]:
     """Update setup task fields"""
     allowed = ["status", "notes", "completed_by", "completed_at", "metadata"]
@@ -714,24 +915,27 @@ def delete_setup_tasks_for_factory(factory_id: str) -> int:
         return cursor.rowcount
 
 
-def get_setup_progress(factory_id: str) -> Dict[str, Any]:
-    """Get setup progress summary for a factory"""
+def get_setup_progress(factory_id: str) -> Optional[Dict[str, Any]]:
+    """Get setup progress summary for a factory (None if the factory does not exist)"""
     with get_db() as conn:
         cursor = conn.cursor()
         p = "%s" if USE_POSTGRES else "?"
 
-        cursor.execute(f"SELECT COUNT(*) FROM setup_tasks WHERE factory_id = {p}", (factory_id,))
-        total = cursor.fetchone()[0]
-
-        cursor.execute(f"SELECT COUNT(*) FROM setup_tasks WHERE factory_id = {p} AND status = 'completed'", (factory_id,))
-        completed = cursor.fetchone()[0]
-
-        cursor.execute(f"SELECT COUNT(*) FROM setup_tasks WHERE factory_id = {p} AND required = true", (factory_id,))
-        required_total = cursor.fetchone()[0]
-
-        cursor.execute(f"SELECT COUNT(*) FROM setup_tasks WHERE factory_id = {p} AND required = true AND status = 'completed'", (factory_id,))
-        required_completed = cursor.fetchone()[0]
+        cursor.execute(f"""
+            SELECT COUNT(t.id),
+                   COALESCE(SUM(CASE WHEN t.status = 'completed' THEN 1 ELSE 0 END), 0),
+                   COALESCE(SUM(CASE WHEN t.required = true THEN 1 ELSE 0 END), 0),
+                   COALESCE(SUM(CASE WHEN t.required = true AND t.status = 'completed' THEN 1 ELSE 0 END), 0)
+            FROM factories f
+            LEFT JOIN setup_tasks t ON t.factory_id = f.id
+            WHERE f.id = {p}
+            GROUP BY f.id
+        """, (factory_id,))
+        row = cursor.fetchone()
+        if row is None:
+            return None
 
+        total, completed, required_total, required_completed = row[0], row[1], row[2], row[3]
         return {
             "total": total,
             "completed": completed,
@@ -842,25 +1046,41 @@ def update_setting(key: str, value: str) -> Optional[Dict[str, Any]]:
 
 
 def update_settings_batch(updates: Dict[str, str]) -> Dict[str, Any]:
-    """Update multiple settings at once"""
+    """Update multiple settings at once
+
+    Only existing keys are updated. Postgres does it in one UPDATE ... FROM
+    (VALUES ...) RETURNING; SQLite looks up the existing keys, then runs a
+    single executemany.
+    """
+    if not updates:
+        return {}
     updated_at = datetime.utcnow().isoformat()
-    results = {}
+    rows = [(key, str(value), bool(value and str(value).strip())) for key, value in updates.items()]
 
     with get_db() as conn:
         cursor = conn.cursor()
-        for key, value in updates.items():
-            is_configured = bool(value and str(value).strip())
-            if USE_POSTGRES:
-                cursor.execute("""
-                    UPDATE settings SET value = %s, is_configured = %s, updated_at = %s WHERE key = %s
-                """, (str(value), is_configured, updated_at, key))
-            else:
-                cursor.execute("""
-                    UPDATE settings SET value = ?, is_configured = ?, updated_at = ? WHERE key = ?
-                """, (str(value), is_configured, updated_at, key))
-            results[key] = {"updated": cursor.rowcount > 0}
+        if USE_POSTGRES:
+            values = ", ".join(["(%s, %s, %s::boolean)"] * len(rows))
+            cursor.execute(f"""
+                UPDATE settings AS s
+                SET value = v.value, is_configured = v.is_configured, updated_at = %s
+                FROM (VALUES {values}) AS v(key, value, is_configured)
+                WHERE s.key = v.key
+                RETURNING s.key
+            """, (updated_at, *(x for row in rows for x in row)))
+            updated = {row[0] for row in cursor.fetchall()}
+        else:
+            cursor.execute(
+                f"SELECT key FROM settings WHERE key IN ({_params(len(rows))})",
+                [key for key, _, _ in rows]
+            )
+            updated = {row[0] for row in cursor.fetchall()}
+            cursor.executemany(
+                "UPDATE settings SET value = ?, is_configured = ?, updated_at = ? WHERE key = ?",
+                [(value, is_configured, updated_at, key) for key, value, is_configured in rows if key in updated]
+            )
 
-    return results
+    return {key: {"updated": key in updated} for key in updates}
 
 
 def get_settings_status() -> Dict[str, Any]:
@@ -931,5 +1151,42 @@ def _row_to_setting(row, cursor=None) -> Dict[str, Any]:
     return setting
 
 
+# =============================================================================
+# AI Response Cache
+# =============================================================================
+
+AI_CACHE_TTL = 7 * 24 * 3600  # seconds
+
+
+def get_ai_cache(key: str) -> Optional[str]:
+    """Get a cached AI response if it is younger than AI_CACHE_TTL"""
+    cutoff = int(time.time()) - AI_CACHE_TTL
+    with get_db() as conn:
+        cursor = conn.cursor()
+        p = "%s" if USE_POSTGRES else "?"
+        cursor.execute(f"SELECT response_text FROM ai_cache WHERE key = {p} AND created_at >= {p}", (key, cutoff))
+        row = cursor.fetchone()
+        return row[0] if row else None
+
+
+def put_ai_cache(key: str, model: str, response_text: str):
+    """Store an AI response and drop expired entries"""
+    now = int(time.time())
+    with get_db() as conn:
+        cursor = conn.cursor()
+        if USE_POSTGRES:
+            cursor.execute("""
+                INSERT INTO ai_cache (key, model, response_text, created_at) VALUES (%s, %s, %s, %s)
+                ON CONFLICT (key) DO UPDATE SET model = EXCLUDED.model,
+                    response_text = EXCLUDED.response_text, created_at = EXCLUDED.created_at
+            """, (key, model, response_text, now))
+            cursor.execute("DELETE FROM ai_cache WHERE created_at < %s", (now - AI_CACHE_TTL,))
+        else:
+            cursor.execute("""
+                INSERT OR REPLACE INTO ai_cache (key, model, response_text, created_at) VALUES (?, ?, ?, ?)
+            """, (key, model, response_text, now))
+            cursor.execute("DELETE FROM ai_cache WHERE created_at < ?", (now - AI_CACHE_TTL,))
+
+
 # Initialize database on import
 init_db()
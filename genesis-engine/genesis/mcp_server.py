@@ -574,41 +574,29 @@ class GenesisMCPServer:
         try:
             from .architecture_patterns import VBDCodeTemplates
 
-            templates = VBDCodeTemplates()
             generated = {}
 
-            replacements = {
-                "{domain}": domain,
-                "{domain_lower}": domain.lower(),
-                "{domain_description}": f"{domain} operations",
-                "{operation}": domain.lower(),
+            context = {
+                "domain": domain,
+                "domain_lower": domain.lower(),
+                "domain_description": f"{domain} operations",
+                "operation": domain.lower(),
             }
 
             for component in components:
-                if component == "dto":
-                    template = templates.dto_template()
-                elif component == "engine":
-                    template = templates.engine_template()
-                elif component == "manager":
-                    template = templates.manager_template()
-                elif component == "adapter":
-                    template = templates.adapter_template()
-                    replacements["{system}"] = "Database"
-                    replacements["{system_lower}"] = "database"
-                    replacements["{interface}"] = "Repository"
-                    replacements["{interface_lower}"] = "repository"
-                    replacements["{resource}"] = domain.lower() + "s"
-                elif component == "interface":
-                    template = templates.interface_template()
-                    replacements["{interface}"] = "Repository"
-                    replacements["{interface_description}"] = f"{domain} data access"
-                else:
+                if component not in VBDCodeTemplates.TEMPLATE_NAMES:
                     continue
+                if component == "adapter":
+                    context["system"] = "Database"
+                    context["system_lower"] = "database"
+                    context["interface"] = "Repository"
+                    context["interface_lower"] = "repository"
+                    context["resource"] = domain.lower() + "s"
+                elif component == "interface":
+                    context["interface"] = "Repository"
+                    context["interface_description"] = f"{domain} data access"
 
-                # Apply replacements
-                code = template
-                for key, value in replacements.items():
-                    code = code.replace(key, value)
+                code = VBDCodeTemplates.render(component, **context)
 
                 generated[component] = {
                     "filename": f"{domain.lower()}_{component}.py",
@@ -618,7 +606,8 @@ class GenesisMCPServer:
             return {
                 "domain": domain,
                 "components": list(generated.keys()),
-                "files": generated
+                "files": generated,
+                "requirements": VBDCodeTemplates.requirements(generated)
             }
 
         except ImportError as e:
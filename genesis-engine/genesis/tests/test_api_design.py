@@ -0,0 +1,129 @@
+"""
+Tests for the API design assistant's module-level helpers
+"""
+
+import hashlib
+import pickle
+
+import orjson
+import pytest
+
+from genesis import assistants_enhanced_api_design as api_design
+from genesis.assistants_enhanced_api_design import (
+    EnhancedAPIDesignAssistant,
+    find_url_antipatterns,
+    http_methods,
+    section_etag,
+    section_json,
+)
+
+# ============================================================================
+# URL anti-patterns
+# ============================================================================
+
+@pytest.mark.parametrize("url, expected", [
+    ("GET /getUser/123.json", ["verb_in_path", "mixed_case_path", "file_extension"]),
+    ("POST /users/create", ["verb_in_path"]),
+    ("/orders/addItem", ["verb_in_path", "mixed_case_path"]),
+    ("/user_profiles", ["underscore_in_path"]),
+    ("https://api.example.com/v1/delete_order", ["verb_in_path", "underscore_in_path"]),
+])
+def test_find_url_antipatterns_flags_bad_paths(url, expected):
+    assert find_url_antipatterns(url) == expected
+
+
+@pytest.mark.parametrize("url", [
+    "GET /users/123",
+    "/add-ons",
+    "/address",
+    "/products?price_min=100",
+    "https://api.example.com/v1/orders",
+])
+def test_find_url_antipatterns_accepts_good_paths(url):
+    assert find_url_antipatterns(url) == []
+
+
+@pytest.mark.parametrize("url", ["", "   ", "GET", "DELETE users"])
+def test_find_url_antipatterns_needs_a_path(url):
+    assert find_url_antipatterns(url) == []
+
+
+# ============================================================================
+# Pre-encoded sections and ETags
+# ============================================================================
+
+@pytest.mark.parametrize("section", api_design.JSON_SECTIONS)
+def test_section_json_matches_section(section):
+    data = getattr(EnhancedAPIDesignAssistant, section)()
+    assert orjson.loads(section_json(section)) == orjson.loads(orjson.dumps(data))
+
+
+@pytest.mark.parametrize("section", api_design.JSON_SECTIONS)
+def test_section_etag_is_quoted_body_hash(section):
+    digest = hashlib.blake2b(section_json(section), digest_size=16).hexdigest()
+    assert section_etag(section) == f'"{digest}"'
+
+
+def test_section_etags_differ_per_section():
+    etags = {section_etag(section) for section in api_design.JSON_SECTIONS}
+    assert len(etags) == len(api_design.JSON_SECTIONS)
+
+
+def test_section_json_rejects_unknown_sections():
+    with pytest.raises(KeyError):
+        section_json("graphql_best_practices")
+
+
+# ============================================================================
+# Knowledge sections
+# ============================================================================
+
+def test_memoized_sections_are_read_only():
+    section = EnhancedAPIDesignAssistant.rate_limiting()
+    with pytest.raises(TypeError):
+        section["extra"] = 1
+
+
+def test_memoized_sections_copy_to_plain_containers():
+    section = EnhancedAPIDesignAssistant.pagination_patterns()
+    copied = pickle.loads(pickle.dumps(section))
+    copied["extra"] = 1
+    assert "extra" not in EnhancedAPIDesignAssistant.pagination_patterns()
+
+
+def test_http_methods_back_the_richardson_section():
+    level_2 = EnhancedAPIDesignAssistant.richardson_maturity_model()["level_2_http_verbs"]
+    served = level_2["http_methods"]
+    assert list(served) == list(http_methods())
+    for name, spec in http_methods().items():
+        assert served[name]["idempotent"] == spec.idempotent
+        assert served[name]["purpose"] == spec.purpose
+
+
+# ============================================================================
+# Findings
+# ============================================================================
+
+def _finding():
+    return EnhancedAPIDesignAssistant().generate_finding(
+        "API-001", "Verb in URL", "HIGH", "REST", "desc", "/getUsers", "/users", "REST naming"
+    )
+
+
+def test_findings_have_independent_migration_steps():
+    first = _finding()
+    first.migration_strategy["steps"].append("5. Extra")
+    assert len(_finding().migration_strategy["steps"]) == 4
+
+
+def test_finding_model_is_exposed_lazily():
+    finding = _finding()
+    assert isinstance(finding, api_design.APIDesignFinding)
+    assert pickle.loads(pickle.dumps(finding)) == finding
+
+
+def test_finding_json_schema_is_cached_per_call_copy():
+    model = api_design.APIDesignFinding
+    schema = model.model_json_schema()
+    schema["title"] = "changed"
+    assert model.model_json_schema()["title"] == "APIDesignFinding"
@@ -0,0 +1,82 @@
+"""
+Tests for VBDCodeTemplates rendering
+"""
+
+import ast
+import asyncio
+import io
+
+import pytest
+
+from genesis.architecture_patterns import VBDCodeTemplates, _compile, _render_plan, _SafeCtx
+
+CONTEXT = {
+    "domain": "Order",
+    "domain_lower": "order",
+    "domain_description": "Order operations",
+    "operation": "total",
+    "system": "Stripe",
+    "system_lower": "stripe",
+    "interface": "PaymentGateway",
+    "interface_lower": "payment_gateway",
+    "interface_description": "Payment processing",
+    "resource": "charges",
+}
+
+
+@pytest.mark.parametrize("template", [
+    "no fields",
+    "{a}",
+    "x{a}y",
+    "{a}{b} and {a} again, then {{literal}}",
+])
+def test_render_plan_matches_format_map(template):
+    context = {"a": 1, "b": "two"}
+    assert _render_plan(_compile(template), context) == template.format_map(context)
+
+
+def test_compile_rejects_format_specs():
+    with pytest.raises(ValueError):
+        _compile("{a:>10}")
+
+
+def test_missing_placeholders_are_left_in_place():
+    assert _render_plan(_compile("{a}-{b}"), _SafeCtx(a="x")) == "x-{b}"
+
+
+@pytest.mark.parametrize("name", VBDCodeTemplates.TEMPLATE_NAMES)
+def test_templates_render_valid_python(name):
+    ast.parse(VBDCodeTemplates.render(name, **CONTEXT))
+
+
+@pytest.mark.parametrize("name", VBDCodeTemplates.TEMPLATE_NAMES)
+def test_render_variants_agree(name):
+    rendered = VBDCodeTemplates.render(name, **CONTEXT)
+    stream = io.StringIO()
+    VBDCodeTemplates.render_to(name, stream, **CONTEXT)
+
+    assert "".join(VBDCodeTemplates.iter_render(name, **CONTEXT)) == rendered
+    assert stream.getvalue() == rendered
+    assert VBDCodeTemplates.render_bytes(name, **CONTEXT) == rendered.encode("utf-8")
+    assert VBDCodeTemplates.render_many(name, [CONTEXT, CONTEXT]) == [rendered, rendered]
+
+
+def test_unknown_template_raises_key_error():
+    with pytest.raises(KeyError):
+        VBDCodeTemplates.render("repository", **CONTEXT)
+
+
+def test_write_files_matches_render(tmp_path):
+    jobs = [
+        (name, tmp_path / "out" / f"{name}.py", CONTEXT)
+        for name in VBDCodeTemplates.TEMPLATE_NAMES
+    ]
+    asyncio.run(VBDCodeTemplates.write_files(jobs, max_concurrency=2))
+
+    for name, path, context in jobs:
+        assert path.read_bytes() == VBDCodeTemplates.render_bytes(name, **context)
+
+
+def test_requirements_cover_generated_imports():
+    assert VBDCodeTemplates.requirements(["adapter", "dto"]) == ["httpx", "msgspec", "pydantic>=2"]
+    assert VBDCodeTemplates.requirements(["engine"]) == []
@@ -0,0 +1,149 @@
+"""
+Tests for the SQLite paths in genesis.database
+
+Each test runs against a fresh database file under tmp_path.
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from genesis import database as db
+
+
+@pytest.fixture(autouse=True)
+def fresh_db(tmp_path, monkeypatch):
+    if db.USE_POSTGRES:
+        pytest.skip("SQLite-only tests")
+    monkeypatch.setattr(db, "DB_PATH", tmp_path / "genesis.db")
+    db.close_connections()
+    db.init_db()
+    yield
+    db.close_connections()
+
+
+def _backdate_factory(factory_id: str, seconds: float) -> None:
+    created_at = (datetime.utcnow() - timedelta(seconds=seconds)).isoformat()
+    with db.get_db() as conn:
+        conn.execute("UPDATE factories SET created_at = ? WHERE id = ?", (created_at, factory_id))
+
+
+# ============================================================================
+# AI response cache
+# ============================================================================
+
+def test_ai_cache_round_trip():
+    assert db.get_ai_cache("k1") is None
+    db.put_ai_cache("k1", "model-a", "reply")
+    assert db.get_ai_cache("k1") == "reply"
+
+
+def test_ai_cache_replaces_existing_entry():
+    db.put_ai_cache("k1", "model-a", "first")
+    db.put_ai_cache("k1", "model-a", "second")
+    assert db.get_ai_cache("k1") == "second"
+
+
+def test_ai_cache_entries_expire_after_ttl(monkeypatch):
+    db.put_ai_cache("k1", "model-a", "reply")
+    now = db.time.time()
+    monkeypatch.setattr(db.time, "time", lambda: now + db.AI_CACHE_TTL + 1)
+    assert db.get_ai_cache("k1") is None
+
+
+def test_put_ai_cache_drops_expired_rows(monkeypatch):
+    db.put_ai_cache("old", "model-a", "stale")
+    now = db.time.time()
+    monkeypatch.setattr(db.time, "time", lambda: now + db.AI_CACHE_TTL + 1)
+    db.put_ai_cache("new", "model-a", "fresh")
+    with db.get_db() as conn:
+        keys = [row[0] for row in conn.execute("SELECT key FROM ai_cache")]
+    assert keys == ["new"]
+
+
+# ============================================================================
+# Setup tasks
+# ============================================================================
+
+def _drafts():
+    return [
+        db.SetupTaskDraft(key="infra", category="infrastructure", title="Provision"),
+        db.SetupTaskDraft(key="stripe", category="integration", title="Stripe",
+                          task_type="api_key", required=False, metadata={"service": "stripe"}),
+        db.SetupTaskDraft(key="hipaa", category="compliance", title="HIPAA"),
+    ]
+
+
+def test_create_setup_tasks_bulk_keeps_order():
+    db.create_factory(id="f1", name="F", domain="d")
+    created = db.create_setup_tasks_bulk("f1", _drafts())
+
+    assert [t["id"] for t in created] == ["f1-infra", "f1-stripe", "f1-hipaa"]
+    stored = db.get_setup_tasks_for_factory("f1")
+    assert [t["id"] for t in stored] == ["f1-infra", "f1-stripe", "f1-hipaa"]
+    assert [t["order_index"] for t in stored] == [0, 1, 2]
+    assert stored[1]["metadata"] == {"service": "stripe"}
+    assert not stored[1]["required"]
+
+
+def test_create_setup_tasks_bulk_replaces_previous_tasks():
+    db.create_factory(id="f1", name="F", domain="d")
+    db.create_setup_tasks_bulk("f1", _drafts())
+    db.create_setup_tasks_bulk("f1", _drafts()[:1])
+
+    assert [t["id"] for t in db.get_setup_tasks_for_factory("f1")] == ["f1-infra"]
+
+
+def test_create_setup_tasks_bulk_unknown_factory_writes_nothing():
+    assert db.create_setup_tasks_bulk("missing", _drafts()) is None
+    assert db.get_setup_tasks_for_factory("missing") == []
+
+
+def test_iter_setup_tasks_matches_list_across_batches():
+    db.create_factory(id="f1", name="F", domain="d")
+    db.create_setup_tasks_bulk("f1", _drafts())
+
+    streamed = list(db.iter_setup_tasks_for_factory("f1", batch_size=2))
+    assert streamed == db.get_setup_tasks_for_factory("f1")
+
+
+def test_setup_progress_counts_required_tasks():
+    db.create_factory(id="f1", name="F", domain="d")
+    db.create_setup_tasks_bulk("f1", _drafts())
+    db.update_setup_task("f1-infra", status="completed")
+
+    progress = db.get_setup_progress("f1")
+    assert progress["total"] == 3
+    assert progress["completed"] == 1
+    assert progress["required_total"] == 2
+    assert progress["required_completed"] == 1
+    assert progress["percent"] == 33
+    assert db.get_setup_progress("missing") is None
+
+
+# ============================================================================
+# Provisioning and connections
+# ============================================================================
+
+def test_mark_provisioned_older_than():
+    db.create_factory(id="old", name="Old", domain="d", status="provisioning")
+    db.create_factory(id="new", name="New", domain="d", status="provisioning")
+    db.create_factory(id="done", name="Done", domain="d", status="active")
+    _backdate_factory("old", 60)
+    _backdate_factory("done", 60)
+
+    assert db.mark_provisioned_older_than(30) == 1
+    assert db.get_factory("old")["status"] == "active"
+    assert db.get_factory("new")["status"] == "provisioning"
+
+
+def test_connections_reopen_after_close_on_other_threads():
+    from concurrent.futures import ThreadPoolExecutor
+
+    def query():
+        return db.get_connection().execute("SELECT 1").fetchone()[0]
+
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        assert pool.submit(query).result() == 1
+        db.close_connections()
+        assert pool.submit(query).result() == 1
@@ -0,0 +1,195 @@
+"""
+Tests for the API server's AI reply cache and assistant pattern endpoint
+
+The Anthropic API is replaced with an httpx.MockTransport; every test runs
+against a fresh SQLite database under tmp_path.
+"""
+
+import asyncio
+import importlib.util
+import json
+from pathlib import Path
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+# Load the server the same way it loads database.py, without genesis/__init__
+_server_path = Path(__file__).parent.parent / "api" / "server.py"
+_spec = importlib.util.spec_from_file_location("genesis_api_server", _server_path)
+server = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(server)
+db = server.db
+
+
+@pytest.fixture(autouse=True)
+def fresh_db(tmp_path, monkeypatch):
+    if db.USE_POSTGRES:
+        pytest.skip("SQLite-only tests")
+    monkeypatch.setattr(db, "DB_PATH", tmp_path / "genesis.db")
+    db.close_connections()
+    db.init_db()
+    server.invalidate_settings_cache()
+    yield
+    db.close_connections()
+
+
+@pytest.fixture
+def anthropic(monkeypatch):
+    """Route Anthropic calls to canned replies, keyed by prompt"""
+    replies = {}
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        prompt = json.loads(request.content)["messages"][0]["content"]
+        calls.append(prompt)
+        return replies[prompt]
+
+    monkeypatch.setattr(
+        server, "ANTHROPIC_CLIENT", httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    )
+    return replies, calls
+
+
+def _reply(text: str, stop_reason: str = "end_turn") -> httpx.Response:
+    return httpx.Response(200, json={"content": [{"text": text}], "stop_reason": stop_reason})
+
+
+def _sse(*events) -> httpx.Response:
+    body = "".join(f"data: {json.dumps(event)}\n\n" for event in events)
+    return httpx.Response(200, text=body, headers={"content-type": "text/event-stream"})
+
+
+def _cached(prompt: str, max_tokens: int = 100):
+    return db.get_ai_cache(server._ai_cache_key(server.get_ai_model(), max_tokens, prompt))
+
+
+def _call(prompt: str, parse=None):
+    return asyncio.run(server._anthropic_call("sk-test", prompt, 100, parse=parse))
+
+
+async def _stream(prompt: str) -> str:
+    return "".join([part async for part in server._anthropic_stream("sk-test", prompt, 100)])
+
+
+# ============================================================================
+# AI reply cache
+# ============================================================================
+
+def test_ai_cache_key_depends_on_every_input():
+    key = server._ai_cache_key("model-a", 100, "prompt")
+    assert key == server._ai_cache_key("model-a", 100, "prompt")
+    assert key != server._ai_cache_key("model-b", 100, "prompt")
+    assert key != server._ai_cache_key("model-a", 200, "prompt")
+    assert key != server._ai_cache_key("model-a", 100, "prompt2")
+
+
+def test_anthropic_call_replays_cached_reply(anthropic):
+    replies, calls = anthropic
+    replies["p"] = _reply("hello")
+
+    assert _call("p") == "hello"
+    assert _call("p") == "hello"
+    assert calls == ["p"]
+
+
+def test_anthropic_call_skips_cache_for_truncated_reply(anthropic):
+    replies, calls = anthropic
+    replies["p"] = _reply("[1, 2", stop_reason="max_tokens")
+
+    assert _call("p") == "[1, 2"
+    assert _cached("p") is None
+
+
+def test_anthropic_call_caches_only_parseable_replies(anthropic):
+    replies, _ = anthropic
+    replies["bad"] = _reply("not json")
+    replies["good"] = _reply('```json\n[{"a": 1}]\n```')
+
+    with pytest.raises(ValueError):
+        _call("bad", parse=server._parse_json_reply)
+    assert _cached("bad") is None
+
+    assert _call("good", parse=server._parse_json_reply) == [{"a": 1}]
+    assert _cached("good") is not None
+
+
+def test_anthropic_stream_caches_completed_reply(anthropic):
+    replies, _ = anthropic
+    replies["p"] = _sse(
+        {"type": "content_block_delta", "delta": {"text": "he"}},
+        {"type": "content_block_delta", "delta": {"text": "llo"}},
+        {"type": "message_delta", "delta": {"stop_reason": "end_turn"}},
+        {"type": "message_stop"},
+    )
+
+    assert asyncio.run(_stream("p")) == "hello"
+    assert _cached("p") == "hello"
+
+
+@pytest.mark.parametrize("events", [
+    # Connection closed before message_stop
+    [{"type": "content_block_delta", "delta": {"text": "he"}}],
+    # Cut off at max_tokens
+    [
+        {"type": "content_block_delta", "delta": {"text": "he"}},
+        {"type": "message_delta", "delta": {"stop_reason": "max_tokens"}},
+        {"type": "message_stop"},
+    ],
+])
+def test_anthropic_stream_skips_cache_for_incomplete_reply(anthropic, events):
+    replies, _ = anthropic
+    replies["p"] = _sse(*events)
+
+    assert asyncio.run(_stream("p")) == "he"
+    assert _cached("p") is None
+
+
+def test_anthropic_stream_raises_on_error_event(anthropic):
+    replies, _ = anthropic
+    replies["p"] = _sse(
+        {"type": "content_block_delta", "delta": {"text": "he"}},
+        {"type": "error", "error": {"type": "overloaded_error", "message": "Overloaded"}},
+    )
+
+    with pytest.raises(server.HTTPException) as exc:
+        asyncio.run(_stream("p"))
+    assert exc.value.status_code == 502
+    assert _cached("p") is None
+
+
+# ============================================================================
+# Assistant patterns
+# ============================================================================
+
+PATTERN_URL = "/api/assistants/api_design/patterns/"
+
+
+@pytest.fixture
+def client():
+    with TestClient(server.app) as c:
+        yield c
+
+
+def test_pattern_returns_etag_and_honours_if_none_match(client):
+    url = PATTERN_URL + "rate_limiting"
+    first = client.get(url)
+    assert first.status_code == 200
+    etag = first.headers["etag"]
+
+    def status(if_none_match: str) -> int:
+        return client.get(url, headers={"If-None-Match": if_none_match}).status_code
+
+    assert status(etag) == 304
+    assert status(f'W/"other", W/{etag}') == 304
+    assert status("*") == 304
+    assert status('"other"') == 200
+
+
+@pytest.mark.parametrize("name", ["__init__", "__class__", "_get_tools", "nope", "name"])
+def test_pattern_endpoint_only_serves_public_zero_argument_methods(client, name):
+    assert client.get(PATTERN_URL + name).status_code == 404
+
+
+def test_pattern_endpoint_rejects_methods_needing_arguments(client):
+    assert client.get(PATTERN_URL + "generate_finding").status_code == 400